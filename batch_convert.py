@@ -0,0 +1,209 @@
+import argparse
+import os
+from pathlib import Path
+from parallel import run_parallel
+from script import build_language_dict
+from catalog_writer import write_catalog
+from catalog_binary import compile_catalog, EXTENSION as BINARY_EXTENSION
+from merge_engine import STRATEGIES
+from metrics import Metrics, metrics, log
+
+SHEET_EXTENSIONS = ('.xlsx', '.csv')
+
+def expand_sources(paths):
+    """
+    Turn the given workbooks, CSV files and folders into an ordered list of files.
+    Folders contribute their .xlsx/.csv files in name order (D4, D6_2, D6_3, ...).
+    """
+    sources = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            sources.extend(sorted(p for p in path.iterdir() if p.suffix in SHEET_EXTENSIONS))
+        else:
+            sources.append(path)
+    return sources
+
+def _sheet_catalogs(df):
+    """{lang: {key: value}} for one sheet, keys in the first column, one column per language"""
+    import pandas as pd
+
+    key_column = df.columns[0]
+    catalogs = {}
+    for lang_code in df.columns[1:]:
+        if pd.isna(lang_code) or lang_code == '' or str(lang_code).startswith('Unnamed:'):
+            continue
+        catalogs[str(lang_code)], _ = build_language_dict(df[key_column], df[lang_code])
+    return catalogs
+
+def _read_source(task):
+    """
+    Read the sheets of one workbook (all, or only those in sheet_names) or a CSV file
+    in a single pass; runs in a worker.
+    Returns (source, [(sheet label, {lang: {key: value}})], error, metrics snapshot).
+    """
+    import pandas as pd
+
+    file_path, sheet_names = task
+    task_metrics = Metrics()
+    try:
+        with task_metrics.stage("read"):
+            if file_path.endswith('.csv'):
+                sheets = {None: pd.read_csv(file_path)}
+            elif file_path.endswith('.xlsx'):
+                # One open of the workbook for all its tabs, in tab order
+                with pd.ExcelFile(file_path) as workbook:
+                    if sheet_names:
+                        # Only the requested tabs are parsed; the others are never loaded
+                        wanted = [name for name in workbook.sheet_names if name in sheet_names]
+                        sheets = pd.read_excel(workbook, sheet_name=wanted) if wanted else {}
+                    else:
+                        sheets = pd.read_excel(workbook, sheet_name=None)
+            else:
+                raise ValueError("File must be .xlsx or .csv format")
+        layers = []
+        with task_metrics.stage("transform"):
+            for sheet_name, df in sheets.items():
+                label = file_path if sheet_name is None else f"{file_path} [{sheet_name}]"
+                if df.shape[1] < 2:
+                    layers.append((label, {}))
+                    continue
+                layers.append((label, _sheet_catalogs(df)))
+        task_metrics.incr("sheets_read", len(layers))
+        return file_path, layers, None, task_metrics.snapshot()
+    except Exception as e:
+        task_metrics.incr("sources_failed")
+        return file_path, [], str(e), task_metrics.snapshot()
+
+def merge_layers_in_memory(layers, strategy="overwrite"):
+    """
+    Fold the per-sheet catalogs into one catalog per language.
+
+    Args:
+        layers (list): (label, {lang: {key: value}}) in precedence order, lowest first
+        strategy (str): How a later sheet combines with earlier ones (see merge_engine.STRATEGIES)
+
+    Returns:
+        tuple: ({lang: merged catalog}, {lang: number of keys a later sheet overrode})
+    """
+    merge = STRATEGIES[strategy]
+    merged = {}
+    overridden = {}
+    for _, catalogs in layers:
+        for lang_code, catalog in catalogs.items():
+            if lang_code not in merged:
+                merged[lang_code] = catalog
+                overridden[lang_code] = 0
+                continue
+            current = merged[lang_code]
+            overridden[lang_code] += sum(
+                1 for key, value in catalog.items() if key in current and current[key] != value
+            )
+            merged[lang_code] = merge(current, catalog)
+    return merged, overridden
+
+def _write_locale(task):
+    """Write one merged locale (and optionally its binary catalog); runs in a worker"""
+    lang_code, json_data, output_directory, compile_binary = task
+    filepath = os.path.join(output_directory, f"{lang_code}.json")
+    try:
+        write_catalog(filepath, json_data)
+        if compile_binary:
+            compile_catalog(json_data, os.path.join(output_directory, f"{lang_code}{BINARY_EXTENSION}"))
+        return lang_code, filepath, None
+    except Exception as e:
+        return lang_code, filepath, str(e)
+
+def convert_batch(sources, output_directory="translations", strategy="overwrite", sheet_names=None,
+                  workers=1, use_threads=False, compile_binary=False):
+    """
+    Convert a delivery batch of workbooks and sheets into one set of <lang>.json files.
+
+    Every workbook is read once, with all of its tabs, in parallel. The sheets
+    are then merged in memory in precedence order - sources in the order given,
+    tabs in workbook order, later ones winning - and each locale is written
+    exactly once. This replaces converting every sheet into its own folder and
+    merging the folders afterwards.
+
+    Args:
+        sources (list): Workbooks, CSV files or folders of them, lowest precedence first
+        output_directory (str): Directory to save JSON files
+        strategy (str): 'overwrite' (later sheets win per key), 'deep-overwrite'
+                        or 'append' (see merge_engine.STRATEGIES)
+        sheet_names (list, optional): Only read the tabs with these names
+        workers (int): Number of workbooks read, and locales written, in parallel
+        use_threads (bool): Use threads instead of processes for the workers
+        compile_binary (bool): Also write a binary <lang>.lcat catalog for each language
+
+    Returns:
+        dict: {lang: path written}; empty if a source could not be read
+    """
+    if strategy not in STRATEGIES:
+        print(f"Error: Unknown merge strategy '{strategy}' (choose from {', '.join(STRATEGIES)})")
+        return {}
+
+    files = [str(path) for path in expand_sources(sources)]
+    if not files:
+        print("No .xlsx or .csv files to convert.")
+        return {}
+
+    print(f"Converting {len(files)} files (lowest precedence first):")
+    for file_path in files:
+        log(f"  - {file_path}")
+
+    results = run_parallel(_read_source, [(file_path, sheet_names) for file_path in files], workers, use_threads)
+    layers = []
+    failed = False
+    for file_path, file_layers, error, task_metrics in results:
+        metrics.merge(task_metrics)
+        if error:
+            print(f"  ✗ Error reading {file_path}: {error}")
+            failed = True
+            continue
+        for label, catalogs in file_layers:
+            if catalogs:
+                log(f"  ✓ Read {label}: {len(catalogs)} languages")
+            else:
+                log(f"  Skipping {label}: no language columns")
+            layers.append((label, catalogs))
+    if failed:
+        # A missing layer would silently bring back values it overrides
+        print("Nothing written: fix the sources above and run again.")
+        return {}
+
+    with metrics.stage("merge"):
+        merged, overridden = merge_layers_in_memory(layers, strategy)
+
+    os.makedirs(output_directory, exist_ok=True)
+    tasks = [(lang_code, json_data, output_directory, compile_binary) for lang_code, json_data in merged.items()]
+    with metrics.stage("write"):
+        written = run_parallel(_write_locale, tasks, workers, use_threads)
+
+    paths = {}
+    for lang_code, filepath, error in written:
+        if error:
+            metrics.incr("files_failed")
+            print(f"  ✗ Error creating {filepath}: {error}")
+            continue
+        paths[lang_code] = filepath
+        metrics.incr("files_written")
+        metrics.incr("keys_written", len(merged[lang_code]))
+        message = f"  ✓ Created: {filepath} ({len(merged[lang_code])} translations"
+        if overridden[lang_code]:
+            metrics.incr("keys_overridden", overridden[lang_code])
+            message += f", {overridden[lang_code]} overridden by later sheets"
+        log(message + ")")
+
+    print(f"\n🎉 {len(paths)} translation files created from {len(layers)} sheets in '{output_directory}' directory")
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert several workbooks and sheets into one set of locale files")
+    parser.add_argument("sources", nargs="+", help="Workbooks, CSV files or folders of them, lowest precedence first")
+    parser.add_argument("--output", default="translations", help="Output directory (default: translations)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="overwrite")
+    parser.add_argument("--sheet", action="append", help="Only read tabs with this name (repeatable)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of workbooks read in parallel")
+    parser.add_argument("--binary", action="store_true", help="Also write compiled <lang>.lcat catalogs")
+    args = parser.parse_args()
+
+    convert_batch(args.sources, args.output, args.strategy, args.sheet, args.workers, compile_binary=args.binary)
@@ -0,0 +1,356 @@
+"""
+Benchmark harness for the conversion, merge, pluralization and translation pipelines.
+
+Every benchmark generates a synthetic catalog (N keys x M locales, nesting
+depth, value length), runs one pipeline against it in a fresh process and
+records wall time, throughput, peak RSS and per-stage timings. Results are
+written to a JSON report so runs on different commits can be compared:
+
+    python benchmark.py --keys 5000 --locales 30 --output before.json
+    python benchmark.py --keys 5000 --locales 30 --output after.json --compare before.json
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+WORDS = [
+    "room", "save", "cancel", "booking", "guest", "check", "in", "out", "night", "price",
+    "total", "pay", "now", "later", "your", "stay", "confirm", "details", "add", "remove",
+]
+
+# Synthetic data
+
+def generate_text(rng, value_length):
+    """Random UI-like text of roughly value_length characters"""
+    words = []
+    length = 0
+    while length < value_length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words).capitalize()
+
+def generate_catalog(num_keys, depth=1, value_length=20, seed=0):
+    """
+    Generate a nested catalog with num_keys leaf strings.
+
+    Args:
+        num_keys (int): Number of leaf strings
+        depth (int): Nesting depth of the leaves (1 = flat)
+        value_length (int): Approximate length of each value
+        seed (int): Random seed, so catalogs are reproducible
+    """
+    rng = random.Random(seed)
+    catalog = {}
+    for i in range(num_keys):
+        node = catalog
+        for level in range(depth - 1):
+            node = node.setdefault(f"section_{i % (7 + level)}_{level}", {})
+        node[f"key_{i}"] = generate_text(rng, value_length)
+    return catalog
+
+def locale_codes(num_locales):
+    return [f"l{i:02d}" for i in range(num_locales)]
+
+def write_sheet(path, num_keys, num_locales, value_length=20, seed=0):
+    """Write a key x locale sheet (.csv or .xlsx) like the Google Sheets exports"""
+    rng = random.Random(seed)
+    header = ["key"] + locale_codes(num_locales)
+    rows = (
+        [f"key_{i}"] + [generate_text(rng, value_length) for _ in range(num_locales)]
+        for i in range(num_keys)
+    )
+    if path.endswith(".xlsx"):
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+        workbook.save(path)
+    else:
+        import csv
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+def write_locale_folder(folder, num_keys, num_locales, depth=1, value_length=20, seed=0, plural_every=0):
+    """Write one <locale>.json catalog per locale into folder"""
+    os.makedirs(folder, exist_ok=True)
+    for i, lang in enumerate(locale_codes(num_locales)):
+        catalog = generate_catalog(num_keys, depth, value_length, seed + i)
+        if plural_every:
+            for j, key in enumerate(list(catalog)):
+                if j % plural_every == 0:
+                    catalog[key] = [f"{key} (one)", f"{key} (other)"]
+        with open(os.path.join(folder, f"{lang}.json"), "w", encoding="utf-8") as f:
+            json.dump(catalog, f, ensure_ascii=False, indent=2)
+
+# Stub translation server
+
+class StubTranslateHandler(BaseHTTPRequestHandler):
+    """Answers translate_a/single requests in the endpoint's response format"""
+
+    latency = 0.0
+
+    def _respond(self, params):
+        if self.latency:
+            time.sleep(self.latency)
+        text = params.get("q", [""])[0]
+        target = params.get("tl", ["xx"])[0]
+        # One segment per line, like the real endpoint, so batching can split it back
+        segments = [[f"[{target}] {line}", line, None, None, 1] for line in text.splitlines(keepends=True)]
+        body = json.dumps([segments, None, "en"]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        params = parse_qs(urlparse(self.path).query)
+        length = int(self.headers.get("Content-Length", 0))
+        params.update(parse_qs(self.rfile.read(length).decode("utf-8")))
+        self._respond(params)
+
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def stub_translation_server(latency=0.0):
+    """Run a local translation endpoint in a background thread and yield its URL"""
+    handler = type("Handler", (StubTranslateHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/translate_a/single"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+# Benchmarks
+#
+# Each benchmark takes (workdir, params, stages) and returns the number of items
+# processed. stages is a dict the benchmark fills with per-stage timings; the
+# "generate" and "import" stages are reported but excluded from throughput.
+
+@contextlib.contextmanager
+def stage(stages, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+def bench_convert_csv(workdir, params, stages):
+    with stage(stages, "import"):
+        import script
+    path = os.path.join(workdir, "sheet.csv")
+    with stage(stages, "generate"):
+        write_sheet(path, params["keys"], params["locales"], params["value_length"])
+    with stage(stages, "convert"):
+        script.convert_sheet_to_json_files(path, os.path.join(workdir, "out"))
+    return params["keys"] * params["locales"]
+
+def bench_convert_xlsx(workdir, params, stages):
+    with stage(stages, "import"):
+        import localization
+    path = os.path.join(workdir, "sheet.xlsx")
+    with stage(stages, "generate"):
+        write_sheet(path, params["keys"], params["locales"], params["value_length"])
+    with stage(stages, "convert"):
+        localization.excel_to_json_files(path, os.path.join(workdir, "out"))
+    return params["keys"] * params["locales"]
+
+def _bench_merge(module_name, workdir, params, stages):
+    with stage(stages, "import"):
+        module = __import__(module_name)
+    folder1 = os.path.join(workdir, "folder1")
+    folder2 = os.path.join(workdir, "folder2")
+    with stage(stages, "generate"):
+        write_locale_folder(folder1, params["keys"], params["locales"], params["depth"], params["value_length"])
+        write_locale_folder(folder2, params["keys"] // 2, params["locales"], params["depth"], params["value_length"], seed=1)
+    with stage(stages, "merge"):
+        module.merge_json_files(folder1, folder2)
+    return params["keys"] * params["locales"]
+
+def bench_merge_append(workdir, params, stages):
+    return _bench_merge("merge_json_files", workdir, params, stages)
+
+def bench_merge_overwrite(workdir, params, stages):
+    return _bench_merge("merge_replace_old_value", workdir, params, stages)
+
+def bench_pluralize(workdir, params, stages):
+    with stage(stages, "import"):
+        import insert
+    folder = os.path.join(workdir, "translations")
+    with stage(stages, "generate"):
+        write_locale_folder(folder, params["keys"], params["locales"], 1, params["value_length"], plural_every=10)
+    with stage(stages, "pluralize"):
+        # The generated plural lists sit under key_N, which the default patterns don't match
+        insert.process_json_files_in_directory(folder, patterns=["*"])
+    return params["keys"] * params["locales"]
+
+def bench_translate(workdir, params, stages):
+    with stage(stages, "import"):
+        import localization_openai
+    base = generate_catalog(params["translate_keys"], params["depth"], params["value_length"])
+    localization_openai.rate_limiter.max_rate = localization_openai.rate_limiter.rate = 1e9
+    localization_openai.rate_limiter.burst = 1e9
+    localization_openai.translation_memory = None
+    with stub_translation_server(params["latency"]) as url:
+        localization_openai.TRANSLATE_URL = url
+        session = localization_openai.create_session()
+        with stage(stages, "translate"):
+            for lang in locale_codes(params["translate_locales"]):
+                localization_openai.translate_dict(base, lang, {}, session=session)
+        session.close()
+    return params["translate_keys"] * params["translate_locales"]
+
+def bench_translate_offline(workdir, params, stages):
+    """translate_dict against the in-process echo backend: no sockets, no HTTP"""
+    with stage(stages, "import"):
+        import localization_openai
+        from translation_backends import EchoBackend
+    base = generate_catalog(params["translate_keys"], params["depth"], params["value_length"])
+    localization_openai.translation_memory = None
+    localization_openai.backend = EchoBackend(latency=params["latency"])
+    with stage(stages, "translate"):
+        for lang in locale_codes(params["translate_locales"]):
+            localization_openai.translate_dict(base, lang, {})
+    return params["translate_keys"] * params["translate_locales"]
+
+BENCHMARKS = {
+    "convert_csv": bench_convert_csv,
+    "convert_xlsx": bench_convert_xlsx,
+    "merge_append": bench_merge_append,
+    "merge_overwrite": bench_merge_overwrite,
+    "pluralize": bench_pluralize,
+    "translate": bench_translate,
+    "translate_offline": bench_translate_offline,
+}
+
+# Runner
+
+def _run_in_child(name, params):
+    """Run one benchmark in the current (fresh) process and measure it"""
+    stages = {}
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            items = BENCHMARKS[name](workdir, params, stages)
+            total = time.perf_counter() - start
+    # Generating the input and importing modules are not part of the measured pipeline
+    seconds = total - stages.get("generate", 0.0) - stages.get("import", 0.0)
+    return {
+        "name": name,
+        "items": items,
+        "seconds": round(seconds, 4),
+        "items_per_second": round(items / seconds, 1) if seconds else None,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024), 1),
+        "stages": {key: round(value, 4) for key, value in stages.items()},
+    }
+
+def run_benchmark(name, params):
+    """Run one benchmark in a freshly spawned process so peak RSS is its own"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_in_child, name, params).result()
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def compare_reports(baseline, current):
+    """Print the change in time and peak RSS for every benchmark present in both reports"""
+    previous = {result["name"]: result for result in baseline["results"]}
+    print(f"\n=== COMPARED WITH {baseline.get('commit')} ===")
+    for result in current["results"]:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+        time_ratio = result["seconds"] / old["seconds"] if old["seconds"] else float("nan")
+        print(
+            f"{result['name']:<16} {old['seconds']:>9.3f}s -> {result['seconds']:>9.3f}s ({time_ratio:.2f}x)  "
+            f"{old['peak_rss_mb']:>7.1f}MB -> {result['peak_rss_mb']:>7.1f}MB"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the localization pipelines")
+    parser.add_argument("--keys", type=int, default=2000, help="Keys per catalog / rows per sheet")
+    parser.add_argument("--locales", type=int, default=10, help="Locales per sheet / folder")
+    parser.add_argument("--depth", type=int, default=1, help="Nesting depth of catalog keys")
+    parser.add_argument("--value-length", type=int, default=20, help="Approximate characters per value")
+    parser.add_argument("--translate-keys", type=int, default=200, help="Keys translated per locale")
+    parser.add_argument("--translate-locales", type=int, default=2, help="Locales translated")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub server latency per request in seconds")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--output", default="benchmark_report.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", help="Previous report to compare against")
+    args = parser.parse_args()
+
+    params = {
+        "keys": args.keys,
+        "locales": args.locales,
+        "depth": args.depth,
+        "value_length": args.value_length,
+        "translate_keys": args.translate_keys,
+        "translate_locales": args.translate_locales,
+        "latency": args.latency,
+    }
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": params,
+        "results": [],
+    }
+
+    for name in args.only or BENCHMARKS:
+        print(f"Running {name}...")
+        try:
+            result = run_benchmark(name, params)
+        except Exception as e:
+            print(f"  ✗ {name} failed: {e}")
+            continue
+        report["results"].append(result)
+        print(
+            f"  ✓ {result['seconds']:.3f}s, {result['items_per_second']} items/s, "
+            f"peak RSS {result['peak_rss_mb']} MB"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare_reports(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
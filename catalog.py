@@ -0,0 +1,223 @@
+"""
+Flat, slot-based representation of translation catalogs.
+
+Every key path (e.g. ("home", "title") for {"home": {"title": ...}}) is
+assigned a slot once, in a KeySpace shared by the catalogs that are
+compared or combined with each other (the base catalog and its 30
+locales, say). A Catalog then only holds its values, in a list indexed by
+slot, so those catalogs hold one copy of the keys between them, and any
+leaf can be read or replaced in O(1) without walking or copying nested
+dicts.
+
+to_nested() rebuilds the original JSON exactly, key order included.
+"""
+import sys
+import threading
+
+class _Missing:
+    """Marks a slot the catalog has no value for"""
+
+    def __reduce__(self):
+        return "MISSING"  # Unpickles to the module's own instance, so identity checks hold in workers
+
+    def __repr__(self):
+        return "MISSING"
+
+MISSING = _Missing()
+
+class _Node:
+    """One level of the key trie: leaf slots and sub-sections by segment"""
+
+    __slots__ = ("leaves", "sections")
+
+    def __init__(self):
+        self.leaves = {}
+        self.sections = {}
+
+class KeySpace:
+    """
+    Append-only table of key paths. Slots are never reused, so a slot means
+    the same path in every catalog sharing the key space. Safe to fill from
+    several threads at once (e.g. validator workers sharing the base catalog).
+
+    A key space lives as long as the catalogs using it; create one per run or
+    comparison rather than keeping one for the whole process.
+    """
+
+    def __init__(self):
+        self.paths = []  # Slot -> path tuple
+        self.index = {}  # Path tuple -> slot
+        self.root = _Node()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getstate__(self):
+        return self.paths, self.index, self.root
+
+    def __setstate__(self, state):
+        self.paths, self.index, self.root = state
+        self._lock = threading.Lock()
+
+    def _section(self, node, segment):
+        child = node.sections.get(segment)
+        if child is None:
+            # setdefault is atomic: racing threads end up sharing one node
+            child = node.sections.setdefault(segment, _Node())
+        return child
+
+    def _add(self, node, path):
+        """Slot of path, a leaf of node; added if it is new"""
+        with self._lock:
+            slot = node.leaves.get(path[-1])
+            if slot is None:
+                slot = len(self.paths)
+                self.paths.append(path)
+                self.index[path] = slot
+                node.leaves[path[-1]] = slot
+            return slot
+
+class Catalog:
+    """
+    Catalog leaves addressed by key path.
+
+    Paths are tuples of segments, or strings with segments separated by dots
+    (use tuples for keys that contain dots).
+    """
+
+    __slots__ = ("keys", "_values", "_order", "_count")
+
+    def __init__(self, keys=None):
+        self.keys = keys if keys is not None else KeySpace()
+        self._values = []  # Slot -> value, MISSING where the catalog has no such leaf
+        self._order = None  # Slots in catalog order; None while that is simply slot order
+        self._count = 0
+
+    @classmethod
+    def from_nested(cls, data, keys=None, is_leaf=None):
+        """
+        Build a catalog from nested JSON data.
+
+        Args:
+            data (dict): The catalog, as loaded from a <lang>.json file
+            keys (KeySpace, optional): Key space to share with other catalogs
+                                       (default: a new one)
+            is_leaf (callable, optional): Treat dicts for which this returns
+                                          True as single values (e.g. plural forms)
+        """
+        catalog = cls(keys)
+        keys = catalog.keys
+        slots = []
+        leaf_values = []
+        stack = [((), keys.root, iter(data.items()))]
+        while stack:
+            prefix, node, items = stack[-1]
+            for key, value in items:
+                # Empty dicts are kept as leaves so they survive the round trip
+                if isinstance(value, dict) and value and not (is_leaf is not None and is_leaf(value)):
+                    stack.append((prefix + (key,), keys._section(node, key), iter(value.items())))
+                    break
+                slot = node.leaves.get(key)
+                if slot is None:
+                    slot = keys._add(node, prefix + (sys.intern(key),))
+                slots.append(slot)
+                leaf_values.append(value)
+            else:
+                stack.pop()
+        catalog._load(slots, leaf_values)
+        return catalog
+
+    def _load(self, slots, leaf_values):
+        """Fill an empty catalog from parallel lists of slots and values, in catalog order"""
+        if not slots:
+            return
+        values = [MISSING] * (max(slots) + 1)
+        for slot, value in zip(slots, leaf_values):
+            values[slot] = value
+        self._values = values
+        self._count = len(slots)
+        in_slot_order = all(previous < slot for previous, slot in zip(slots, slots[1:]))
+        self._order = None if in_slot_order else slots
+
+    def _path(self, key):
+        return key if isinstance(key, tuple) else tuple(key.split("."))
+
+    def _has(self, slot):
+        return slot is not None and slot < len(self._values) and self._values[slot] is not MISSING
+
+    def _slots(self):
+        if self._order is not None:
+            return self._order
+        return [slot for slot, value in enumerate(self._values) if value is not MISSING]
+
+    def get(self, key, default=None):
+        slot = self.keys.index.get(self._path(key))
+        return self._values[slot] if self._has(slot) else default
+
+    def __getitem__(self, key):
+        slot = self.keys.index.get(self._path(key))
+        if not self._has(slot):
+            raise KeyError(key)
+        return self._values[slot]
+
+    def __setitem__(self, key, value):
+        """Replace the value of an existing leaf"""
+        slot = self.keys.index.get(self._path(key))
+        if not self._has(slot):
+            raise KeyError(key)
+        self._values[slot] = value
+
+    def remove(self, key):
+        """Remove a leaf"""
+        slot = self.keys.index.get(self._path(key))
+        if not self._has(slot):
+            raise KeyError(key)
+        self._values[slot] = MISSING
+        if self._order is not None:
+            self._order.remove(slot)
+        self._count -= 1
+
+    def __contains__(self, key):
+        return self._has(self.keys.index.get(self._path(key)))
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        paths = self.keys.paths
+        return (paths[slot] for slot in self._slots())
+
+    def items(self):
+        """(path, value) for every leaf, in catalog order"""
+        paths = self.keys.paths
+        values = self._values
+        return ((paths[slot], values[slot]) for slot in self._slots())
+
+    def copy(self):
+        catalog = Catalog(self.keys)
+        catalog._values = list(self._values)
+        catalog._order = None if self._order is None else list(self._order)
+        catalog._count = self._count
+        return catalog
+
+    def to_nested(self):
+        """Rebuild the nested JSON data, in the original key order"""
+        data = {}
+        for path, value in self.items():
+            node = data
+            for segment in path[:-1]:
+                child = node.get(segment)
+                if child is None:
+                    child = node[segment] = {}
+                node = child
+            node[path[-1]] = value
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Catalog):
+            return NotImplemented
+        return list(self.items()) == list(other.items())
+
+    def __repr__(self):
+        return f"<Catalog with {len(self)} leaves>"
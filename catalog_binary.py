@@ -0,0 +1,247 @@
+"""
+Compiled binary catalogs (.lcat) with a memory-mapped key index.
+
+Layout (little-endian):
+    header   magic b"LCAT", version (u16), reserved (u16), entry count (u32)
+    entries  one fixed-size record per leaf, sorted by key bytes:
+             key offset, key length, value offset, value length,
+             original position (u32 each), value kind (u8), 3 bytes padding
+    keys     UTF-8 key paths, nested segments joined by KEY_SEPARATOR
+    values   UTF-8 strings, or JSON text for non-string leaves
+
+A reader maps the file and binary-searches the entry table, so a lookup
+touches a handful of pages instead of parsing the whole catalog. The
+original key order is stored too, so to_dict() rebuilds the exact JSON.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+MAGIC = b"LCAT"
+VERSION = 1
+KEY_SEPARATOR = "\x1f"  # Cannot appear in keys, unlike "."
+EXTENSION = ".lcat"
+
+_HEADER = struct.Struct("<4sHHI")
+_ENTRY = struct.Struct("<IIIIIB3x")
+
+KIND_STRING = 0
+KIND_JSON = 1
+
+def _flatten(data, prefix, leaves):
+    for key, value in data.items():
+        if KEY_SEPARATOR in key:
+            raise ValueError(f"Key {key!r} contains the reserved separator {KEY_SEPARATOR!r}")
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            _flatten(value, path, leaves)
+        else:
+            leaves.append((path, value))
+    return leaves
+
+def compile_catalog(data, output_path):
+    """
+    Compile a catalog (as loaded from a <lang>.json file) into a binary catalog.
+
+    Args:
+        data (dict): The catalog; nested dicts become separator-joined key paths
+        output_path (str): Where to write the .lcat file
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Only JSON objects can be compiled into a binary catalog")
+
+    leaves = _flatten(data, (), [])
+    encoded = []
+    for order, (path, value) in enumerate(leaves):
+        key_bytes = KEY_SEPARATOR.join(path).encode("utf-8")
+        if isinstance(value, str):
+            kind, value_bytes = KIND_STRING, value.encode("utf-8")
+        else:
+            kind, value_bytes = KIND_JSON, json.dumps(value, ensure_ascii=False).encode("utf-8")
+        encoded.append((key_bytes, value_bytes, kind, order))
+    encoded.sort(key=lambda entry: entry[0])
+
+    keys_start = _HEADER.size + _ENTRY.size * len(encoded)
+    values_start = keys_start + sum(len(key_bytes) for key_bytes, _, _, _ in encoded)
+
+    table = bytearray()
+    key_offset = keys_start
+    value_offset = values_start
+    for key_bytes, value_bytes, kind, order in encoded:
+        table += _ENTRY.pack(key_offset, len(key_bytes), value_offset, len(value_bytes), order, kind)
+        key_offset += len(key_bytes)
+        value_offset += len(value_bytes)
+
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(encoded)))
+        f.write(table)
+        for key_bytes, _, _, _ in encoded:
+            f.write(key_bytes)
+        for _, value_bytes, _, _ in encoded:
+            f.write(value_bytes)
+    os.replace(temp_path, output_path)
+
+def compile_json_file(json_path, output_path=None):
+    """Compile <lang>.json into <lang>.lcat (next to it unless output_path is given)"""
+    json_path = Path(json_path)
+    if output_path is None:
+        output_path = json_path.with_suffix(EXTENSION)
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    compile_catalog(data, output_path)
+    return output_path
+
+def compile_directory(directory):
+    """Compile every JSON catalog in a directory"""
+    compiled = []
+    for json_path in sorted(Path(directory).glob("*.json")):
+        try:
+            compiled.append(compile_json_file(json_path))
+            print(f"  ✓ Compiled {json_path.name}")
+        except Exception as e:
+            print(f"  ✗ Error compiling {json_path.name}: {e}")
+    return compiled
+
+class BinaryCatalog:
+    """
+    Read-only view of a compiled catalog.
+
+    Lookups binary-search the memory-mapped entry table; nothing is parsed
+    up front. Keys are tuples of path segments, or strings: a top-level key
+    as written, or else nested segments separated by dots.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a binary catalog")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} binary catalog")
+
+    def _entry(self, index):
+        return _ENTRY.unpack_from(self._map, _HEADER.size + index * _ENTRY.size)
+
+    def _key_bytes(self, entry):
+        return self._map[entry[0]:entry[0] + entry[1]]
+
+    def _value(self, entry):
+        raw = self._map[entry[2]:entry[2] + entry[3]].decode("utf-8")
+        return raw if entry[5] == KIND_STRING else json.loads(raw)
+
+    def _find(self, key):
+        if isinstance(key, tuple):
+            return self._search(KEY_SEPARATOR.join(key))
+        # Flat catalogs (as script.py writes them) have real dots in their keys,
+        # so the key as given wins over reading it as a dotted path
+        entry = self._search(key)
+        if entry is None and "." in key:
+            entry = self._search(key.replace(".", KEY_SEPARATOR))
+        return entry
+
+    def _search(self, key):
+        target = key.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._entry(middle)
+            current = self._key_bytes(entry)
+            if current < target:
+                low = middle + 1
+            elif current > target:
+                high = middle
+            else:
+                return entry
+        return None
+
+    def get(self, key, default=None):
+        entry = self._find(key)
+        return default if entry is None else self._value(entry)
+
+    def __getitem__(self, key):
+        entry = self._find(key)
+        if entry is None:
+            raise KeyError(key)
+        return self._value(entry)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def keys(self):
+        """Key paths (as tuples) in sorted order"""
+        for index in range(self._count):
+            yield tuple(self._key_bytes(self._entry(index)).decode("utf-8").split(KEY_SEPARATOR))
+
+    def to_dict(self):
+        """Rebuild the original nested catalog, in its original key order"""
+        entries = sorted((self._entry(index) for index in range(self._count)), key=lambda entry: entry[4])
+        data = {}
+        for entry in entries:
+            path = self._key_bytes(entry).decode("utf-8").split(KEY_SEPARATOR)
+            node = data
+            for segment in path[:-1]:
+                node = node.setdefault(segment, {})
+            node[path[-1]] = self._value(entry)
+        return data
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def verify_round_trip(json_path, binary_path):
+    """True if the binary catalog decodes back to exactly the JSON file's content"""
+    with open(json_path, "r", encoding="utf-8") as f:
+        original = json.load(f)
+    with BinaryCatalog(binary_path) as catalog:
+        restored = catalog.to_dict()
+    return json.dumps(original, ensure_ascii=False) == json.dumps(restored, ensure_ascii=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile and inspect binary translation catalogs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser("compile", help="Compile a JSON file or every JSON file in a directory")
+    compile_parser.add_argument("path")
+    get_parser = subparsers.add_parser("get", help="Look up one key (as written, or nested segments separated by dots)")
+    get_parser.add_argument("path")
+    get_parser.add_argument("key")
+    dump_parser = subparsers.add_parser("dump", help="Print a binary catalog as JSON")
+    dump_parser.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        if os.path.isdir(args.path):
+            compile_directory(args.path)
+        else:
+            output_path = compile_json_file(args.path)
+            status = "✓" if verify_round_trip(args.path, output_path) else "✗ round trip mismatch"
+            print(f"{status} {output_path}")
+    elif args.command == "get":
+        with BinaryCatalog(args.path) as catalog:
+            if args.key not in catalog:
+                print(f"Key '{args.key}' not found")
+                sys.exit(1)
+            print(catalog[args.key])
+    else:
+        with BinaryCatalog(args.path) as catalog:
+            print(json.dumps(catalog.to_dict(), ensure_ascii=False, indent=2))
@@ -0,0 +1,84 @@
+import argparse
+import json
+from parallel import run_parallel
+from merge_engine import scan_folders
+from catalog_utils import diff_catalogs, diff_counts
+
+def _diff_file(task):
+    """Diff one locale file present in both folders; runs in a worker"""
+    filename, old_file, new_file = task
+    try:
+        with open(old_file, 'r', encoding='utf-8') as f:
+            old_data = json.load(f)
+        with open(new_file, 'r', encoding='utf-8') as f:
+            new_data = json.load(f)
+        return filename, diff_catalogs(old_data, new_data), None
+    except Exception as e:
+        return filename, None, str(e)
+
+def diff_folders(old_folder, new_folder, workers=1, use_threads=False, report_path=None):
+    """
+    Compare the locale files of two translation folders key by key.
+
+    Nested catalogs are flattened to dotted key paths, so each locale costs one
+    pass over both files. Locales present in only one folder are listed
+    separately.
+
+    Args:
+        old_folder (str): Folder with the current translations (e.g. translations_D4)
+        new_folder (str): Folder to compare with it (e.g. translation_for_D4_2)
+        workers (int): Number of locales diffed in parallel
+        use_threads (bool): Use threads instead of processes for the workers
+        report_path (str, optional): Write the structured diff here as JSON
+
+    Returns:
+        dict: {"locales": {filename: diff}, "errors": {filename: message},
+               "only_in_old": [...], "only_in_new": [...]}
+    """
+    old_files, (new_files,), common_files = scan_folders(old_folder, [new_folder])
+    tasks = [(filename, old_files[filename], new_files[filename]) for filename in common_files]
+    results = run_parallel(_diff_file, tasks, workers, use_threads)
+
+    report = {
+        "locales": {},
+        "errors": {},
+        "only_in_old": sorted(name for name in old_files if name not in new_files),
+        "only_in_new": sorted(name for name in new_files if name not in old_files),
+    }
+    for filename, diff, error in results:
+        if error:
+            report["errors"][filename] = error
+        else:
+            report["locales"][filename] = diff
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+def print_diff(report, max_items=5):
+    """Print a per-locale summary of a diff_folders report"""
+    for filename, diff in report["locales"].items():
+        if not any(diff.values()):
+            print(f"  = {filename}: no changes")
+            continue
+        print(f"  ~ {filename}: {diff_counts(diff)}")
+        for kind, marker in (("added", "+"), ("removed", "-"), ("changed", "~")):
+            for path in list(diff[kind])[:max_items]:
+                print(f"      {marker} {path}")
+    for filename, error in report["errors"].items():
+        print(f"  ✗ {filename}: {error}")
+    for filename in report["only_in_old"]:
+        print(f"  - {filename}: only in the old folder")
+    for filename in report["only_in_new"]:
+        print(f"  + {filename}: only in the new folder")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the added, removed and changed keys between two translation folders")
+    parser.add_argument("old_folder", help="Folder with the current translations")
+    parser.add_argument("new_folder", help="Folder to compare with it")
+    parser.add_argument("--workers", type=int, default=1, help="Number of locales diffed in parallel")
+    parser.add_argument("--report", help="Write the structured diff here as JSON")
+    args = parser.parse_args()
+
+    print_diff(diff_folders(args.old_folder, args.new_folder, args.workers, report_path=args.report))
@@ -0,0 +1,47 @@
+from catalog import Catalog, KeySpace, MISSING
+
+PLURAL_CATEGORY_NAMES = {"zero", "one", "two", "few", "many", "other"}
+
+def is_plural_entry(value):
+    """True for a dict of CLDR plural forms, e.g. {"one": "...", "other": "..."}"""
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(key in PLURAL_CATEGORY_NAMES and isinstance(form, str) for key, form in value.items())
+    )
+
+def flatten_catalog(data, keys=None):
+    """
+    Flatten a nested catalog into a Catalog of leaves (see catalog.Catalog),
+    in the given key space to compare it with other catalogs.
+    Plural entries (see is_plural_entry) and lists are kept as single values,
+    since locales legitimately differ in their plural categories.
+    """
+    return Catalog.from_nested(data, keys, is_leaf=is_plural_entry)
+
+def diff_catalogs(old, new):
+    """
+    Compare two catalogs key by key on their flattened paths.
+
+    Returns:
+        dict: {"added": {path: value}, "removed": {path: value},
+               "changed": {path: {"old": value, "new": value}}},
+              with nested paths joined by dots
+    """
+    keys = KeySpace()
+    old_leaves = flatten_catalog(old if old is not None else {}, keys)
+    new_leaves = flatten_catalog(new, keys)
+    added = {}
+    changed = {}
+    for path, value in new_leaves.items():
+        old_value = old_leaves.get(path, MISSING)
+        if old_value is MISSING:
+            added[".".join(path)] = value
+        elif old_value != value:
+            changed[".".join(path)] = {"old": old_value, "new": value}
+    removed = {".".join(path): value for path, value in old_leaves.items() if path not in new_leaves}
+    return {"added": added, "removed": removed, "changed": changed}
+
+def diff_counts(diff):
+    """Short "N added, N removed, N changed" summary of a diff_catalogs result"""
+    return ", ".join(f"{len(diff[kind])} {kind}" for kind in ("added", "removed", "changed"))
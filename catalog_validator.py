@@ -0,0 +1,242 @@
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from parallel import run_parallel
+from catalog_utils import flatten_catalog
+
+# Interpolation tokens: {name}, {{name}}, %s, %d, %1$s, %@
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*[\w.]+\s*\}\}|\{[\w.]*\}|%(?:\d+\$)?[sdif@]")
+# Opening, closing and self-closing HTML tags, reduced to e.g. "<b>", "</b>", "<br/>"
+TAG_PATTERN = re.compile(r"<\s*(/?)\s*([a-zA-Z][\w-]*)[^>]*?(/?)\s*>")
+UNTRANSLATED_MIN_LENGTH = 4  # Shorter strings ("OK", "PDF") are often the same in every language
+# Plural forms that may spell their number out ("One room"), so leaving out
+# placeholders of the "other" form is only a warning there
+NUMBER_IMPLIED_CATEGORIES = {"zero", "one", "two"}
+
+# Base catalog shared by every locale check, set once per worker. Locales are
+# flattened into its key space, so comparing them is a matter of slot lookups.
+_base = None
+_base_tokens = None
+
+def _placeholders(text):
+    return Counter(PLACEHOLDER_PATTERN.findall(text))
+
+def _tags(text):
+    return Counter(f"<{closing}{name.lower()}{self_closing}>" for closing, name, self_closing in TAG_PATTERN.findall(text))
+
+def _forms(value):
+    """
+    The strings that make up a value, as (form, string) pairs: (None, value)
+    for a string, (category, form) for plural forms, (index, item) for lists.
+    """
+    if isinstance(value, str):
+        return [(None, value)]
+    if isinstance(value, dict):
+        return [(category, form) for category, form in value.items() if isinstance(form, str)]
+    if isinstance(value, list):
+        return [(index, item) for index, item in enumerate(value) if isinstance(item, str)]
+    return []
+
+def _reference_text(value):
+    # The base's "other" (or last) plural form stands in for forms it does not have
+    if isinstance(value, dict):
+        return value.get("other", next(iter(value.values()), ""))
+    if isinstance(value, list):
+        return value[-1] if value and isinstance(value[-1], str) else ""
+    return value if isinstance(value, str) else ""
+
+def _tokens(text):
+    return _placeholders(text), _tags(text)
+
+def _init_validator(base):
+    global _base, _base_tokens
+    _base = base
+    _base_tokens = {}
+    for path, value in base.items():
+        # Tokens of every base form, plus the reference form under None
+        tokens = {form: _tokens(text) for form, text in _forms(value)}
+        tokens[None] = _tokens(_reference_text(value))
+        _base_tokens[path] = tokens
+
+def _expected_tokens(tokens, form, value, base_value):
+    """Tokens of the base form matching form: same plural category, or same position in a list of equal length"""
+    if isinstance(value, list) and not (isinstance(base_value, list) and len(base_value) == len(value)):
+        return tokens[None]
+    return tokens.get(form, tokens[None])
+
+def _validate_locale(file_path):
+    """Compare one locale file with the base catalog; runs in a worker"""
+    result = {
+        "file": str(file_path),
+        "keys": 0,
+        "missing": [],
+        "extra": [],
+        "placeholder_mismatches": [],
+        "tag_mismatches": [],
+        "untranslated": [],
+        "plural_omissions": [],
+        "error": None,
+    }
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        result["error"] = f"Invalid JSON - {e}"
+        return result
+    if not isinstance(data, dict):
+        result["error"] = "Top-level value is not an object"
+        return result
+
+    catalog = flatten_catalog(data, _base.keys)
+    result["keys"] = len(catalog)
+    result["missing"] = [".".join(path) for path in _base if path not in catalog]
+    result["extra"] = [".".join(path) for path in catalog if path not in _base]
+
+    for path, value in catalog.items():
+        base_value = _base.get(path)
+        if base_value is None:
+            continue
+        key = ".".join(path)
+        tokens = _base_tokens[path]
+        omission = None
+        for form, text in _forms(value):
+            found = _placeholders(text)
+            if form in NUMBER_IMPLIED_CATEGORIES:
+                # "One room" for "{count} rooms" is fine; placeholders the other form lacks are not
+                expected = tokens[None][0]
+                if found == expected or found == _expected_tokens(tokens, form, value, base_value)[0]:
+                    continue
+                if not found - expected:
+                    omission = omission or {
+                        "key": key,
+                        "form": form,
+                        "expected": sorted(expected.elements()),
+                        "found": sorted(found.elements()),
+                    }
+                    continue
+            else:
+                expected = _expected_tokens(tokens, form, value, base_value)[0]
+                if found == expected:
+                    continue
+            result["placeholder_mismatches"].append({
+                "key": key,
+                "expected": sorted(expected.elements()),
+                "found": sorted(found.elements()),
+            })
+            break
+        else:
+            if omission:
+                result["plural_omissions"].append(omission)
+        for form, text in _forms(value):
+            found = _tags(text)
+            expected = _expected_tokens(tokens, form, value, base_value)[1]
+            if found != expected:
+                result["tag_mismatches"].append({
+                    "key": key,
+                    "expected": sorted(expected.elements()),
+                    "found": sorted(found.elements()),
+                })
+                break
+        if (
+            isinstance(value, str)
+            and value == base_value
+            and len(value) >= UNTRANSLATED_MIN_LENGTH
+            and any(c.isalpha() for c in value)
+        ):
+            result["untranslated"].append(key)
+    return result
+
+def validate_catalogs(directory, base_file="en-GB.json", workers=1, use_threads=False, report_path=None):
+    """
+    Compare every locale in a directory against the base catalog in one parallel pass.
+
+    Reported per locale:
+    - missing / extra keys (nested keys as dotted paths)
+    - strings whose {placeholders} or HTML tags differ from the base; plural
+      forms are compared form by form, and zero/one/two forms that leave out
+      a placeholder ("One room") are only warned about
+    - strings identical to the base, e.g. left behind by a failed translation
+
+    Args:
+        directory (str): Directory containing <lang>.json files
+        base_file (str): Base catalog, as a file name in directory or a path
+        workers (int): Number of locales checked in parallel
+        use_threads (bool): Use threads instead of processes for the workers
+        report_path (str, optional): Write the machine-readable report here
+
+    Returns:
+        dict: The report; report["summary"]["errors"] is 0 when all locales pass
+    """
+    directory = Path(directory)
+    base_path = directory / base_file
+    if not base_path.exists():
+        base_path = Path(base_file)
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = flatten_catalog(json.load(f))
+
+    locale_files = sorted(
+        path for path in directory.glob("*.json")
+        if path.resolve() != base_path.resolve()
+    )
+    results = run_parallel(
+        _validate_locale, locale_files, workers, use_threads,
+        initializer=_init_validator, initargs=(base,)
+    )
+
+    report = {"base": str(base_path), "base_keys": len(base), "locales": {}}
+    errors = 0
+    warnings = 0
+    for path, result in zip(locale_files, results):
+        report["locales"][path.stem] = result
+        errors += (
+            (1 if result["error"] else 0)
+            + len(result["missing"])
+            + len(result["placeholder_mismatches"])
+            + len(result["tag_mismatches"])
+        )
+        warnings += len(result["extra"]) + len(result["untranslated"]) + len(result["plural_omissions"])
+    report["summary"] = {"locales": len(results), "errors": errors, "warnings": warnings}
+
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+def print_report(report, max_items=5):
+    """Print a short human-readable summary of a validation report"""
+    print(f"\n=== VALIDATING AGAINST {report['base']} ({report['base_keys']} keys) ===")
+    for lang, result in report["locales"].items():
+        if result["error"]:
+            print(f"✗ {lang}: {result['error']}")
+            continue
+        problems = [
+            (name, result[name])
+            for name in ("missing", "placeholder_mismatches", "tag_mismatches", "extra", "untranslated", "plural_omissions")
+            if result[name]
+        ]
+        if not problems:
+            print(f"✓ {lang}: {result['keys']} keys, no issues")
+            continue
+        print(f"✗ {lang}: " + ", ".join(f"{len(items)} {name.replace('_', ' ')}" for name, items in problems))
+        for name, items in problems:
+            for item in items[:max_items]:
+                print(f"    {name}: {item['key'] if isinstance(item, dict) else item}")
+    summary = report["summary"]
+    print(f"\n{summary['locales']} locales checked: {summary['errors']} errors, {summary['warnings']} warnings")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate translation catalogs against the base language")
+    parser.add_argument("directory", help="Directory containing <lang>.json files")
+    parser.add_argument("--base", default="en-GB.json", help="Base catalog file name or path")
+    parser.add_argument("--workers", type=int, default=1, help="Number of locales checked in parallel")
+    parser.add_argument("--report", help="Write the machine-readable JSON report here")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings (extra keys, untranslated strings, plural omissions) too")
+    args = parser.parse_args()
+
+    report = validate_catalogs(args.directory, args.base, args.workers, report_path=args.report)
+    print_report(report)
+    summary = report["summary"]
+    sys.exit(1 if summary["errors"] or (args.strict and summary["warnings"]) else 0)
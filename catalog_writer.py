@@ -0,0 +1,200 @@
+import json
+import os
+import tempfile
+from json.encoder import encode_basestring
+
+try:
+    import orjson
+except ImportError:  # Optional; the json module is used instead
+    orjson = None
+
+NEW_FILE_MODE = 0o644  # Permissions of files write_json_atomic creates; replaced files keep theirs
+ORJSON_CHUNK_KEYS = 2000  # Top-level keys encoded per orjson call when writing a whole catalog
+
+def _orjson_compatible(value):
+    """
+    True if orjson encodes value exactly like json.dumps(..., ensure_ascii=False).
+    Floats are excluded because the two spell exponents differently.
+    """
+    if isinstance(value, str) or value is None or value is True or value is False:
+        return True
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _orjson_compatible(item) for key, item in value.items())
+    if isinstance(value, list):
+        return all(_orjson_compatible(item) for item in value)
+    if isinstance(value, int):
+        return -2 ** 63 <= value < 2 ** 64
+    return False
+
+def encode_value(value, indent=2, level=0):
+    """
+    Encode value as JSON, formatted like json.dumps(value, ensure_ascii=False, indent=indent)
+    and indented for `level` levels of nesting.
+    """
+    if isinstance(value, str):
+        # Most catalog values; the C string encoder is all json.dumps would use too
+        return encode_basestring(value)
+    encoded = None
+    if orjson is not None and indent == 2 and _orjson_compatible(value):
+        try:
+            encoded = orjson.dumps(value, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            pass  # Lone surrogates are rejected by orjson but accepted by json
+    if encoded is None:
+        encoded = json.dumps(value, ensure_ascii=False, indent=indent)
+    if level and '\n' in encoded:
+        encoded = encoded.replace('\n', '\n' + ' ' * (indent * level))
+    return encoded
+
+class IncrementalJsonWriter:
+    """
+    Write a JSON object to disk one key/value pair at a time.
+
+    The output is byte-identical to json.dump(data, f, ensure_ascii=False, indent=indent)
+    for the same pairs, so files produced this way diff cleanly against the
+    ones written from a full dict. Only the keys are kept in memory, to detect
+    duplicates; if any are seen, the file is rewritten on close with dict
+    semantics (first position, last value), exactly as building a dict would.
+
+    With atomic=True the pairs go to a temporary file next to path, which
+    close() renames into place and discard() deletes, so a run that fails
+    halfway leaves the previous file untouched.
+    """
+
+    def __init__(self, path, indent=2, check_duplicates=True, atomic=False):
+        """
+        Args:
+            path (str): Output file path
+            indent (int): Indentation, as for json.dump
+            check_duplicates (bool): Track keys to handle repeats; can be turned
+                                     off when the keys come from a dict
+            atomic (bool): Write through a temporary file, renamed over path on close
+        """
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        self.check_duplicates = check_duplicates
+        self._pad = " " * indent
+        self._seen = set()
+        self._has_duplicates = False
+        self._temp_path = None
+        if atomic:
+            fd, self._temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json",
+                                                   dir=os.path.dirname(str(path)) or ".")
+            self._file = open(fd, 'w', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, key, value):
+        """Append one key/value pair"""
+        if self.check_duplicates:
+            if key in self._seen:
+                self._has_duplicates = True
+            else:
+                self._seen.add(key)
+
+        self._file.write("{\n" if self.count == 0 else ",\n")
+        self._file.write(f"{self._pad}{encode_basestring(key)}: {encode_value(value, self.indent, 1)}")
+        self.count += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.write("{}" if self.count == 0 else "\n}")
+        self._file.close()
+        self._file = None
+
+        written_path = self._temp_path or self.path
+        if self._has_duplicates:
+            with open(written_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            write_catalog(written_path, data, self.indent)
+        if self.check_duplicates:
+            self.count = len(self._seen)
+        self._seen = set()
+
+        if self._temp_path is not None:
+            try:
+                mode = os.stat(self.path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = NEW_FILE_MODE
+            os.chmod(self._temp_path, mode)
+            os.replace(self._temp_path, self.path)
+            self._temp_path = None
+
+    def discard(self):
+        """Stop writing without finishing the file; an atomic writer leaves path as it was"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._temp_path is not None:
+            os.unlink(self._temp_path)
+            self._temp_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self._file is not None:
+            # Leave the partial file as it is rather than closing it off as if complete
+            self.discard()
+            return
+        self.close()
+
+def _write_catalog_orjson(path, data):
+    """
+    Write a catalog with orjson, a chunk of top-level keys at a time, so the
+    encoded output never has to be held in memory all at once.
+    Returns False (without writing) if orjson cannot reproduce json.dump's output.
+    """
+    if not _orjson_compatible(data):
+        return False
+    items = list(data.items())
+    try:
+        with open(path, 'wb') as f:
+            if not items:
+                f.write(b'{}')
+                return True
+            f.write(b'{\n')
+            for start in range(0, len(items), ORJSON_CHUNK_KEYS):
+                chunk = orjson.dumps(dict(items[start:start + ORJSON_CHUNK_KEYS]), option=orjson.OPT_INDENT_2)
+                if start:
+                    f.write(b',\n')
+                f.write(chunk[2:-2])  # Drop the chunk's own "{\n" and "\n}"
+            f.write(b'\n}')
+    except TypeError:
+        return False  # Lone surrogates; json.dump handles them
+    return True
+
+def write_catalog(path, data, indent=2):
+    """
+    Write a catalog to path, using orjson when it is installed.
+    The result is byte-identical to json.dump(data, f, ensure_ascii=False, indent=indent),
+    so diffs of regenerated files stay stable whichever encoder is used.
+    """
+    if orjson is not None and indent == 2 and isinstance(data, dict):
+        if _write_catalog_orjson(path, data):
+            return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+
+def write_json_atomic(path, data, indent=2):
+    """
+    Write data as JSON via a temporary file in the same directory and rename it
+    into place, so an interrupted run never leaves a half-written file behind.
+    """
+    path = str(path)
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        os.close(fd)
+        write_catalog(temp_path, data, indent)
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,197 @@
+"""
+Single entry point for the localization tools.
+
+    python cli.py convert translation.xlsx --output translations
+    python cli.py batch D4.xlsx D6_2.xlsx D6_3.xlsx --output translations
+    python cli.py watch translation.xlsx --output translations
+    python cli.py translate --langs de fr --batch
+    python cli.py translate --langs de --backend echo
+    python cli.py merge translations_D4 translation_for_D4_2 --strategy overwrite
+    python cli.py diff translations_D4 translation_for_D4_2
+    python cli.py pluralize translations_D4
+    python cli.py validate translations --base en-GB.json
+
+Each subcommand imports its module only when it runs, and pandas, openpyxl
+and requests are only imported by the code paths that use them, so merge,
+diff, pluralize and validate start without paying for them.
+"""
+import argparse
+import sys
+
+def cmd_convert(args):
+    if args.preview:
+        from script import preview_data
+        preview_data(args.file)
+    if args.keep_empty:
+        # One JSON file per column named after its header, empty cells kept as null
+        from localization import excel_to_json_files
+        excel_to_json_files(args.file, args.output, args.workers, args.threads, streaming=args.streaming)
+    else:
+        from script import convert_sheet_to_json_files
+        convert_sheet_to_json_files(
+            args.file, args.output or "translations", args.workers, args.threads,
+            chunksize=args.chunksize, compile_binary=args.binary
+        )
+
+def cmd_batch(args):
+    from batch_convert import convert_batch
+    paths = convert_batch(
+        args.sources, args.output, args.strategy, args.sheet, args.workers, args.threads,
+        compile_binary=args.binary
+    )
+    return 0 if paths else 1
+
+def cmd_watch(args):
+    from watch import watch_sheet
+    watch_sheet(args.file, args.output, args.interval)
+
+def cmd_translate(args):
+    import localization_openai as translator
+    if args.base:
+        translator.BASE_LANG_FILE = args.base
+    if args.langs:
+        translator.TARGET_LANGS = args.langs
+    if args.no_memory:
+        translator.TRANSLATION_MEMORY_FILE = None
+    translator.ASYNC_MODE = args.use_async or translator.ASYNC_MODE
+    translator.BATCH_MODE = args.batch or translator.BATCH_MODE
+    translator.COMPILE_BINARY = args.binary or translator.COMPILE_BINARY
+    translator.METRICS_FILE = args.metrics or translator.METRICS_FILE
+    if args.no_mask:
+        translator.MASK_PLACEHOLDERS = False
+    translator.BACKEND = args.backend or translator.BACKEND
+    translator.REPLAY_FILE = args.replay or translator.REPLAY_FILE
+    translator.RECORD_FILE = args.record or translator.RECORD_FILE
+    if args.replay and not args.backend:
+        translator.BACKEND = 'replay'
+    translator.main(args.output)  # Reports its own metrics, including on interruption
+
+def cmd_merge(args):
+    from merge_engine import merge_layers
+    results = merge_layers(
+        args.base_folder, args.overlay_folders, args.strategy, args.output,
+        args.workers, args.threads, dry_run=args.dry_run
+    )
+    return 1 if any(status == "error" for _, status, _, _ in results) else 0
+
+def cmd_diff(args):
+    from catalog_diff import diff_folders, print_diff
+    report = diff_folders(args.old_folder, args.new_folder, args.workers, args.threads, args.report)
+    print_diff(report)
+    return 1 if report["errors"] else 0
+
+def cmd_pluralize(args):
+    from insert import process_json_files_in_directory
+    process_json_files_in_directory(args.directory, args.workers, args.threads, args.pattern)
+
+def cmd_validate(args):
+    if not args.base:
+        from script import validate_json_files
+        validate_json_files(args.directory)
+        return 0
+    from catalog_validator import validate_catalogs, print_report
+    report = validate_catalogs(args.directory, args.base, args.workers, args.threads, args.report)
+    print_report(report)
+    summary = report["summary"]
+    return 1 if summary["errors"] or (args.strict and summary["warnings"]) else 0
+
+def _add_parallel_options(parser):
+    parser.add_argument("--workers", type=int, default=1, help="Number of files processed in parallel")
+    parser.add_argument("--threads", action="store_true", help="Use threads instead of processes for the workers")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Localization tools: convert, translate, merge, diff, pluralize and validate catalogs")
+    parser.add_argument("--quiet", action="store_true", help="Only print summaries and errors, not per-item progress")
+    parser.add_argument("--metrics", help="Export run metrics here (*.json, otherwise Prometheus text format)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="Convert a translation sheet (.xlsx/.csv) into <lang>.json files")
+    convert.add_argument("file", help="Excel or CSV export of the translation sheet")
+    convert.add_argument("--output", help="Output directory (default: translations)")
+    convert.add_argument("--chunksize", type=int, help="Stream CSV files this many rows at a time")
+    convert.add_argument("--binary", action="store_true", help="Also write compiled <lang>.lcat catalogs")
+    convert.add_argument("--keep-empty", action="store_true",
+                         help="Keep empty cells as null, one file per column header (Excel only)")
+    convert.add_argument("--streaming", action="store_true", help="With --keep-empty, read the sheet row by row")
+    convert.add_argument("--preview", action="store_true", help="Print the first rows before converting")
+    _add_parallel_options(convert)
+    convert.set_defaults(func=cmd_convert)
+
+    batch = subparsers.add_parser("batch", help="Convert several workbooks and sheets into one set of locale files")
+    batch.add_argument("sources", nargs="+", help="Workbooks, CSV files or folders of them, lowest precedence first")
+    batch.add_argument("--output", default="translations", help="Output directory (default: translations)")
+    batch.add_argument("--strategy", choices=["append", "deep-overwrite", "overwrite"], default="overwrite",
+                       help="How later sheets combine with earlier ones (default: later sheets win per key)")
+    batch.add_argument("--sheet", action="append", help="Only read tabs with this name (repeatable)")
+    batch.add_argument("--binary", action="store_true", help="Also write compiled <lang>.lcat catalogs")
+    _add_parallel_options(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    watch = subparsers.add_parser("watch", help="Regenerate changed locale files whenever the sheet changes")
+    watch.add_argument("file", help="Excel or CSV export of the translation sheet")
+    watch.add_argument("--output", default="translations", help="Output directory (default: translations)")
+    watch.add_argument("--interval", type=float, default=0.2, help="Seconds between checks of the file")
+    watch.set_defaults(func=cmd_watch)
+
+    translate = subparsers.add_parser("translate", help="Machine-translate the base catalog into the target languages")
+    translate.add_argument("--base", help="Base language file (default: BASE_LANG_FILE)")
+    translate.add_argument("--output", help="Output directory (default: OUTPUT_DIR, or OFFLINE_OUTPUT_DIR "
+                                            "for the echo and replay backends)")
+    translate.add_argument("--langs", nargs="+", help="Target languages (default: TARGET_LANGS)")
+    translate.add_argument("--async", dest="use_async", action="store_true", help="Translate all languages concurrently")
+    translate.add_argument("--batch", action="store_true", help="Pack several short strings into one request")
+    translate.add_argument("--binary", action="store_true", help="Also write compiled <lang>.lcat catalogs")
+    translate.add_argument("--no-memory", action="store_true", help="Do not use the translation memory")
+    translate.add_argument("--no-mask", action="store_true",
+                           help="Send placeholders and markup to the translator unprotected")
+    translate.add_argument("--backend", choices=["google", "echo", "replay"],
+                           help="Translation backend (default: BACKEND); echo and replay need no network")
+    translate.add_argument("--replay", help="Answer from responses recorded with --record (implies --backend replay)")
+    translate.add_argument("--record", help="Append every backend response to this file, for --replay")
+    translate.set_defaults(func=cmd_translate)
+
+    merge = subparsers.add_parser("merge", help="Merge overlay folders onto a base folder")
+    merge.add_argument("base_folder", help="Folder with the current translations")
+    merge.add_argument("overlay_folders", nargs="+", help="Folders to apply on top, oldest first")
+    merge.add_argument("--strategy", choices=["append", "deep-overwrite", "overwrite"], default="append")
+    merge.add_argument("--output", help="Output folder (default: overwrite the base folder)")
+    merge.add_argument("--dry-run", action="store_true", help="Show what would change without writing")
+    _add_parallel_options(merge)
+    merge.set_defaults(func=cmd_merge)
+
+    diff = subparsers.add_parser("diff", help="Show added, removed and changed keys between two folders")
+    diff.add_argument("old_folder", help="Folder with the current translations")
+    diff.add_argument("new_folder", help="Folder to compare with it")
+    diff.add_argument("--report", help="Write the structured diff here as JSON")
+    _add_parallel_options(diff)
+    diff.set_defaults(func=cmd_diff)
+
+    pluralize = subparsers.add_parser("pluralize", help="Rewrite list plural entries as CLDR category objects")
+    pluralize.add_argument("directory", help="Directory containing <lang>.json files")
+    pluralize.add_argument("--pattern", action="append",
+                           help="Dotted key pattern of plural entries (repeatable, default: room)")
+    _add_parallel_options(pluralize)
+    pluralize.set_defaults(func=cmd_pluralize)
+
+    validate = subparsers.add_parser("validate", help="Check catalogs are valid JSON, and against a base catalog")
+    validate.add_argument("directory", help="Directory containing <lang>.json files")
+    validate.add_argument("--base", help="Base catalog to compare every locale with (e.g. en-GB.json)")
+    validate.add_argument("--report", help="Write the machine-readable JSON report here")
+    validate.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    _add_parallel_options(validate)
+    validate.set_defaults(func=cmd_validate)
+
+    return parser
+
+def main(argv=None):
+    import metrics
+    args = build_parser().parse_args(argv)
+    metrics.QUIET = args.quiet
+    status = args.func(args) or 0
+    recorded = metrics.metrics.stages or metrics.metrics.counters
+    if args.command != "translate" and (recorded or args.metrics):
+        metrics.finish_run(args.metrics)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,144 @@
 import os
 import json
+from fnmatch import fnmatch
+from catalog_writer import write_catalog
+from parallel import run_parallel
+from metrics import metrics, log
 
-# Function to convert the room key in each JSON file
-def convert_pluralization(json_data):
-    if "room" in json_data and isinstance(json_data["room"], list) and len(json_data["room"]) == 2:
-        # Convert the "room" key to have "one" and "other" keys for pluralization
-        json_data["room"] = {
-            "one": json_data["room"][0],
-            "other": json_data["room"][1]
+# CLDR cardinal plural categories per language, in the order their forms are listed
+PLURAL_CATEGORIES = {
+    "ar": ["zero", "one", "two", "few", "many", "other"],
+    "bg": ["one", "other"],
+    "cs": ["one", "few", "many", "other"],
+    "da": ["one", "other"],
+    "de": ["one", "other"],
+    "el": ["one", "other"],
+    "en": ["one", "other"],
+    "es": ["one", "many", "other"],
+    "fi": ["one", "other"],
+    "fr": ["one", "many", "other"],
+    "he": ["one", "two", "other"],
+    "hi": ["one", "other"],
+    "hu": ["one", "other"],
+    "id": ["other"],
+    "it": ["one", "many", "other"],
+    "ja": ["other"],
+    "ko": ["other"],
+    "ms": ["other"],
+    "nb": ["one", "other"],
+    "nl": ["one", "other"],
+    "pl": ["one", "few", "many", "other"],
+    "pt": ["one", "many", "other"],
+    "ro": ["one", "few", "other"],
+    "ru": ["one", "few", "many", "other"],
+    "sv": ["one", "other"],
+    "th": ["other"],
+    "tl": ["one", "other"],
+    "tr": ["one", "other"],
+    "uk": ["one", "few", "many", "other"],
+    "vi": ["other"],
+    "zh": ["other"],
+}
+DEFAULT_CATEGORIES = ["one", "other"]
+
+# Dotted key paths (fnmatch patterns) whose list values are plural forms. Only
+# keys known to hold plurals: other lists (e.g. the [old, new] pairs
+# merge_append leaves on conflicts) must not be rewritten.
+PLURAL_KEY_PATTERNS = ["room"]
+
+def plural_categories(locale):
+    """Return the CLDR plural categories for a locale code such as 'pt-BR' or 'zh_Hant'"""
+    if locale is None:
+        return DEFAULT_CATEGORIES
+    language = locale.replace("_", "-").split("-")[0].lower()
+    return PLURAL_CATEGORIES.get(language, DEFAULT_CATEGORIES)
+
+def plural_forms(values, categories):
+    """
+    Map a list of plural forms to CLDR categories.
+
+    A list with one form per category is mapped in order. A two-element
+    [one, other] list, as written for English, fills 'one' from the first
+    form and every other category from the second. Anything else is not
+    treated as a plural entry and None is returned.
+    """
+    if not values or not all(isinstance(value, str) for value in values):
+        return None
+    if len(values) == len(categories):
+        return dict(zip(categories, values))
+    if len(values) == 2:
+        return {
+            category: values[0] if category == "one" else values[1]
+            for category in categories
         }
+    return None
+
+def rewrite_plurals(json_data, categories, patterns=None, path=""):
+    """
+    Replace list-valued plural entries at any nesting depth with category dicts, in place.
+
+    Returns:
+        int: Number of entries rewritten
+    """
+    if patterns is None:
+        patterns = PLURAL_KEY_PATTERNS
+    rewritten = 0
+    for key, value in json_data.items():
+        key_path = f"{path}.{key}" if path else key
+        if isinstance(value, dict):
+            rewritten += rewrite_plurals(value, categories, patterns, key_path)
+        elif isinstance(value, list) and any(fnmatch(key_path, pattern) for pattern in patterns):
+            forms = plural_forms(value, categories)
+            if forms is not None:
+                json_data[key] = forms
+                rewritten += 1
+    return rewritten
+
+# Function to convert the plural entries in each JSON file
+def convert_pluralization(json_data, locale=None, patterns=None):
+    rewrite_plurals(json_data, plural_categories(locale), patterns)
     return json_data
 
+def _process_json_file(task):
+    """Rewrite the plural entries of one file; the file is only written if something changed"""
+    file_path, patterns = task
+    try:
+        # Read the JSON file
+        with open(file_path, "r", encoding="utf-8") as file:
+            json_data = json.load(file)
+
+        locale = os.path.splitext(os.path.basename(file_path))[0]
+        rewritten = rewrite_plurals(json_data, plural_categories(locale), patterns)
+
+        # Write the updated data back to the file
+        if rewritten:
+            write_catalog(file_path, json_data, indent=4)
+        return file_path, rewritten, None
+    except Exception as e:
+        return file_path, 0, str(e)
+
 # Function to process all JSON files in a directory
-def process_json_files_in_directory(directory_path):
-    for filename in os.listdir(directory_path):
-        if filename.endswith(".json"):
-            file_path = os.path.join(directory_path, filename)
-            
-            # Read the JSON file
-            with open(file_path, "r", encoding="utf-8") as file:
-                json_data = json.load(file)
-            
-            # Convert the pluralization for the "room" key
-            updated_data = convert_pluralization(json_data)
-            
-            # Write the updated data back to the file
-            with open(file_path, "w", encoding="utf-8") as file:
-                json.dump(updated_data, file, ensure_ascii=False, indent=4)
-
-# Directory containing all the JSON files (expand the ~ to the full home directory)
-directory_path = os.path.expanduser("~/Desktop/localization_script/translations_D4")
-process_json_files_in_directory(directory_path)
+def process_json_files_in_directory(directory_path, workers=1, use_threads=False, patterns=None):
+    tasks = [
+        (os.path.join(directory_path, filename), patterns)
+        for filename in sorted(os.listdir(directory_path))
+        if filename.endswith(".json")
+    ]
+    with metrics.stage("pluralize"):
+        results = run_parallel(_process_json_file, tasks, workers, use_threads)
+
+    updated = 0
+    for file_path, rewritten, error in results:
+        if error:
+            metrics.incr("files_failed")
+            print(f"✗ {file_path}: {error}")
+        elif rewritten:
+            updated += 1
+            metrics.incr("plural_entries_rewritten", rewritten)
+            log(f"✓ {file_path}: {rewritten} plural entries converted")
+    print(f"{updated} of {len(results)} files updated")
+
+if __name__ == "__main__":
+    # Directory containing all the JSON files (expand the ~ to the full home directory)
+    directory_path = os.path.expanduser("~/Desktop/localization_script/translations_D4")
+    process_json_files_in_directory(directory_path)
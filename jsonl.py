@@ -0,0 +1,45 @@
+"""
+Append-only JSON Lines files that survive being killed mid-write.
+
+A run that dies while appending leaves a torn last line. Readers skip
+lines that do not parse instead of stopping there, and writers start on
+a fresh line, so entries appended after a crash are never glued onto the
+fragment and lost.
+"""
+import json
+import os
+
+def read_jsonl(path):
+    """
+    Return the entries of a JSON Lines file, skipping torn or corrupt lines.
+    A missing file has no entries.
+    """
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    # Read bytes: a line torn inside a multi-byte character must not break the whole file
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+def open_jsonl(path):
+    """Open a JSON Lines file for appending, terminating a torn last line first"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    torn = False
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    f = open(path, "a", encoding="utf-8")
+    if torn:
+        f.write("\n")
+        f.flush()
+    return f
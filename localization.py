@@ -1,9 +1,150 @@
-import pandas as pd
-import json
 import os
 from pathlib import Path
+from parallel import run_parallel
+from catalog_writer import IncrementalJsonWriter, write_catalog
+from metrics import metrics, log
 
-def excel_to_json_files(excel_file_path, output_directory=None):
+# Keys shared by every JSON file, handed to each worker once
+_shared_keys = None
+_shared_output_directory = None
+
+def _init_json_worker(keys, output_directory):
+    global _shared_keys, _shared_output_directory
+    _shared_keys = keys
+    _shared_output_directory = output_directory
+
+def _json_filename(json_file_name):
+    # Clean up file name (remove any invalid characters)
+    safe_filename = "".join(c for c in str(json_file_name))
+    if not safe_filename.endswith('.json'):
+        safe_filename += '.json'
+    return safe_filename
+
+def _write_json_file(task):
+    """Build and write one JSON file from its column; runs in a worker"""
+    import pandas as pd
+    
+    json_file_name, column_data = task
+    
+    # Create dictionary with keys and values
+    json_data = {}
+    for j, key in enumerate(_shared_keys):
+        if j < len(column_data):
+            value = column_data[j]
+            # Handle NaN values
+            if pd.isna(value):
+                json_data[str(key)] = None
+            else:
+                json_data[str(key)] = value
+    
+    # Create full path
+    json_file_path = _shared_output_directory / _json_filename(json_file_name)
+    
+    # Write JSON file
+    write_catalog(json_file_path, json_data)
+    
+    return json_file_path, len(json_data)
+
+def iter_excel_rows(excel_file_path, max_rows=None):
+    """
+    Yield the rows of the first sheet as tuples of cell values.
+    
+    The workbook is opened in read-only mode, so rows are parsed lazily
+    and memory use does not grow with the size of the sheet.
+    
+    Args:
+        excel_file_path (str): Path to the Excel file
+        max_rows (int, optional): Stop after this many rows (header included)
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]  # pd.read_excel reads the first sheet too
+        for row in sheet.iter_rows(max_row=max_rows, values_only=True):
+            yield row
+    finally:
+        workbook.close()
+
+def _header_names(header_row):
+    """Name header cells the way pd.read_excel does (blank -> 'Unnamed: i', repeats -> 'name.1')"""
+    names = []
+    seen = {}
+    for i, cell in enumerate(header_row):
+        name = f"Unnamed: {i}" if cell is None else cell
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _excel_to_json_files_streaming(excel_file_path, output_directory):
+    """
+    Convert an Excel file to JSON files in a single pass over its rows.
+    Each row is appended to one incremental writer per JSON file as soon as
+    it is read, so only the current row is held in memory.
+    """
+    rows = iter_excel_rows(excel_file_path)
+    header = next(rows, None)
+    if header is None:
+        print(f"Error: Excel file '{excel_file_path}' is empty.")
+        return
+    json_file_names = _header_names(header)[1:]  # Skip first column
+    
+    print(f"Converting Excel file: {excel_file_path}")
+    print(f"Output directory: {output_directory}")
+    print(f"Found {len(json_file_names)} JSON files to create")
+    
+    # Written to temporary files until every row has been read, so a bad cell
+    # cannot leave truncated JSON files in place of the existing ones
+    writers = [
+        IncrementalJsonWriter(output_directory / _json_filename(json_file_name), atomic=True)
+        for json_file_name in json_file_names
+    ]
+    key_count = 0
+    blank_rows = 0
+    # Rows are read and written in the same pass, so both are timed as one stage
+    with metrics.stage("read+write"):
+        try:
+            for row in rows:
+                # pd.read_excel drops trailing blank rows but keeps those between data rows
+                if all(cell is None for cell in row):
+                    blank_rows += 1
+                    continue
+                for row_to_write in [()] * blank_rows + [row]:
+                    key = row_to_write[0] if row_to_write else None
+                    # A blank key is NaN in the DataFrame path, which becomes the key 'nan'
+                    key = 'nan' if key is None else str(key)
+                    for i, writer in enumerate(writers):
+                        writer.write(key, row_to_write[i + 1] if i + 1 < len(row_to_write) else None)
+                    key_count += 1
+                blank_rows = 0
+        except BaseException:
+            for writer in writers:
+                writer.discard()
+            raise
+        for writer in writers:
+            writer.close()
+    
+    print(f"Found {key_count} keys")
+    for writer in writers:
+        metrics.incr("files_written")
+        metrics.incr("keys_written", writer.count)
+        log(f"Created: {writer.path} with {writer.count} key-value pairs")
+    
+    print(f"\nSuccessfully converted Excel file to {len(json_file_names)} JSON files!")
+
+def _output_directory(excel_file_path, output_directory):
+    # Default to the directory of the Excel file
+    if output_directory is None:
+        return Path(excel_file_path).parent
+    output_directory = Path(output_directory)
+    output_directory.mkdir(parents=True, exist_ok=True)
+    return output_directory
+
+def excel_to_json_files(excel_file_path, output_directory=None, workers=1, use_threads=False, streaming=False):
     """
     Convert an Excel file to multiple JSON files.
     
@@ -11,16 +152,30 @@ def excel_to_json_files(excel_file_path, output_directory=None):
         excel_file_path (str): Path to the Excel file
         output_directory (str, optional): Directory to save JSON files. 
                                         If None, saves in same directory as Excel file
+        workers (int): Number of JSON files built and written in parallel
+        use_threads (bool): Use threads instead of processes for the workers
+        streaming (bool): Read the sheet row by row in read-only mode and write
+                          every JSON file in the same pass, with bounded memory.
+                          Values keep their cell types (e.g. 3 rather than 3.0)
     
     The function expects:
     - First row: JSON file names (starting from column B)
     - First column: Keys for JSON objects
     - Data starts from row 2, column 2
     """
-    
     try:
+        if streaming:
+            if not Path(excel_file_path).exists():
+                raise FileNotFoundError(excel_file_path)
+            _excel_to_json_files_streaming(excel_file_path, _output_directory(excel_file_path, output_directory))
+            return
+        
+        # pandas takes most of a second to import, so only the DataFrame path pays for it
+        import pandas as pd
+        
         # Read the Excel file
-        df = pd.read_excel(excel_file_path)
+        with metrics.stage("read"):
+            df = pd.read_excel(excel_file_path)
         
         # Get the file names from the first row (excluding the first column)
         json_file_names = df.columns[1:].tolist()  # Skip first column
@@ -29,46 +184,27 @@ def excel_to_json_files(excel_file_path, output_directory=None):
         keys = df.iloc[:, 0].tolist()  # First column values
         
         # Set output directory
-        if output_directory is None:
-            output_directory = Path(excel_file_path).parent
-        else:
-            output_directory = Path(output_directory)
-            output_directory.mkdir(parents=True, exist_ok=True)
+        output_directory = _output_directory(excel_file_path, output_directory)
         
         print(f"Converting Excel file: {excel_file_path}")
         print(f"Output directory: {output_directory}")
         print(f"Found {len(json_file_names)} JSON files to create")
         print(f"Found {len(keys)} keys")
         
-        # Create JSON files
-        for i, json_file_name in enumerate(json_file_names):
-            # Get the column data (excluding header row)
-            column_data = df.iloc[:, i + 1].tolist()  # i+1 because we skip first column
-            
-            # Create dictionary with keys and values
-            json_data = {}
-            for j, key in enumerate(keys):
-                if j < len(column_data):
-                    value = column_data[j]
-                    # Handle NaN values
-                    if pd.isna(value):
-                        json_data[str(key)] = None
-                    else:
-                        json_data[str(key)] = value
-            
-            # Clean up file name (remove any invalid characters)
-            safe_filename = "".join(c for c in str(json_file_name))
-            if not safe_filename.endswith('.json'):
-                safe_filename += '.json'
-            
-            # Create full path
-            json_file_path = output_directory / safe_filename
-            
-            # Write JSON file
-            with open(json_file_path, 'w', encoding='utf-8') as json_file:
-                json.dump(json_data, json_file, indent=2, ensure_ascii=False)
-            
-            print(f"Created: {json_file_path} with {len(json_data)} key-value pairs")
+        # Create JSON files, one column per task; the keys go to each worker only once
+        tasks = [
+            (json_file_name, df.iloc[:, i + 1].tolist())  # i+1 because we skip first column
+            for i, json_file_name in enumerate(json_file_names)
+        ]
+        with metrics.stage("write"):
+            results = run_parallel(
+                _write_json_file, tasks, workers, use_threads,
+                initializer=_init_json_worker, initargs=(keys, output_directory)
+            )
+        for json_file_path, count in results:
+            metrics.incr("files_written")
+            metrics.incr("keys_written", count)
+            log(f"Created: {json_file_path} with {count} key-value pairs")
         
         print(f"\nSuccessfully converted Excel file to {len(json_file_names)} JSON files!")
         
@@ -80,17 +216,32 @@ def excel_to_json_files(excel_file_path, output_directory=None):
 def preview_excel_structure(excel_file_path, num_rows=5):
     """
     Preview the structure of the Excel file to verify the format.
+    Only the header and the first num_rows rows are read.
     
     Args:
         excel_file_path (str): Path to the Excel file
         num_rows (int): Number of rows to preview
     """
+    import pandas as pd
+    from openpyxl import load_workbook
+    
     try:
-        df = pd.read_excel(excel_file_path)
+        workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            rows = list(sheet.iter_rows(max_row=num_rows + 1, values_only=True))
+            # Taken from the sheet's dimension record, so nothing else is parsed
+            total_rows = max((sheet.max_row or 1) - 1, 0)
+            total_columns = sheet.max_column or 0
+        finally:
+            workbook.close()
+        
+        header = _header_names(rows[0]) if rows else []
+        df = pd.DataFrame(rows[1:], columns=header)
         
         print("Excel file structure preview:")
         print("=" * 50)
-        print(f"Shape: {df.shape[0]} rows × {df.shape[1]} columns")
+        print(f"Shape: {total_rows} rows × {total_columns} columns")
         print("\nFirst few rows:")
         print(df.head(num_rows))
         
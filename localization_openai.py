@@ -1,54 +1,267 @@
 import json
 import os
-import time
-import requests
 import html
-import random
+import hashlib
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from rate_limiter import RateLimiter
+from translation_memory import TranslationMemory
+from translation_journal import TranslationJournal
+from translation_backends import TranslationBackend, TranslationError, EchoBackend, ReplayBackend, RecordingBackend
+from placeholder_mask import mask_text, needs_translation, restore_text, RestoreError
+from metrics import metrics, log, finish_run
+from catalog import Catalog, MISSING
+from catalog_utils import flatten_catalog, is_plural_entry
+from catalog_writer import write_catalog
+from catalog_binary import compile_catalog, EXTENSION as BINARY_EXTENSION
 
 # Configuration
 BASE_LANG_FILE = 'assets/translations/en-GB.json'
 TARGET_LANGS = ['ar', 'bg', 'cs', 'da', 'de', 'el', 'es', 'fi', 'fr', 'he', 'hi', 'hu', 'id', 'it', 'ja', 'ko', 'ms', 'nb', 'nl', 'pl', 'pt', 'ro', 'ru', 'sv', 'th', 'tl', 'tr', 'uk', 'vi', 'zh']  # All available locales
 OUTPUT_DIR = 'assets/translations'
+BACKEND = 'google'  # 'google', 'echo' (offline stub) or 'replay' (see translation_backends)
+OFFLINE_BACKENDS = ('echo', 'replay')  # Backends whose output must not end up in the real catalogs
+OFFLINE_OUTPUT_DIR = 'offline_translations'  # Where offline backends write unless given an output directory
+REPLAY_FILE = None  # Recorded responses the replay backend answers from
+RECORD_FILE = None  # Append every response of the backend here, for later replay
+TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+ASYNC_MODE = False  # Translate all languages concurrently instead of one after another
+MAX_CONCURRENT_REQUESTS = 8  # Upper bound on in-flight requests in async mode
+REQUESTS_PER_SECOND = 2.0  # Target request rate across all workers
+RATE_LIMIT_BURST = 5  # Requests allowed back to back before shaping kicks in
+MAX_RETRIES = 5  # Retries for throttled (429) and server (5xx) errors
+BACKOFF_BASE = 1.0  # Seconds before the first retry, doubled on each attempt
+REQUEST_TIMEOUT = 30  # Seconds before a request is abandoned and retried
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+BATCH_MODE = False  # Pack several short strings into one request
+BATCH_MAX_CHARS = 4000  # Upper bound on the joined text of one batch
+BATCH_MAX_ITEMS = 100  # Upper bound on the number of strings in one batch
+BATCH_SEPARATOR = "\n"  # The endpoint keeps line breaks, so lines map back to strings
+TRANSLATION_MEMORY_FILE = os.path.join(OUTPUT_DIR, '.translation_memory.sqlite')  # None to disable
+MANIFEST_DIR = os.path.join(OUTPUT_DIR, '.manifest')  # Hashes of the source strings each locale was translated from
+JOURNAL_DIR = os.path.join(OUTPUT_DIR, '.journal')  # Checkpoints of in-progress languages; None to disable
+COMPILE_BINARY = False  # Also write a memory-mappable <lang>.lcat next to each <lang>.json
+MASK_PLACEHOLDERS = True  # Shield {placeholders}, %s and HTML markup from the translator (see placeholder_mask)
+METRICS_FILE = None  # Export run metrics here at the end (*.json, otherwise Prometheus text format)
+
+rate_limiter = RateLimiter(REQUESTS_PER_SECOND, RATE_LIMIT_BURST, backoff_base=BACKOFF_BASE)
+translation_memory = None  # Opened by main() when TRANSLATION_MEMORY_FILE is set
+translation_journals = {}  # Language -> TranslationJournal for the languages being translated
+backend = None  # TranslationBackend in use; created from BACKEND on first use
+translation_failures = {}  # Language -> {source text: error} for strings that failed this run
+UNTRANSLATED = object()  # Placeholder for a string with no translation yet; left out of the output
 
-# Translation using direct API call to avoid issues with googletrans library
-def translate_text(text, target_lang):
-    if not text or text.strip() == '':
-        return text
+def create_session(pool_size=MAX_CONCURRENT_REQUESTS):
+    """Create an HTTP session whose connection pool is shared by all requests"""
+    import requests
+    from requests.adapters import HTTPAdapter
     
-    try:
-        # Add a delay to avoid rate limiting (randomized between 0.5 and 1.5 seconds)
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        # Use the free Google Translate API endpoint
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            "client": "gtx",
-            "sl": "en",  # Source language
-            "tl": target_lang,  # Target language
-            "dt": "t",  # Return translated text
-            "q": text  # Text to translate
-        }
-        
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            # Parse the response
-            result = response.json()
-            translated_text = ''
-            # Extract all translated parts
-            for part in result[0]:
-                if part[0]:
-                    translated_text += part[0]
-            
-            # Unescape HTML entities
-            translated_text = html.unescape(translated_text)
-            print(f"Translated '{text}' → '{translated_text}'")
-            return translated_text
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _send_request(params, session=None, limiter=None, method="get"):
+    """
+    Send one request to the translation endpoint, shaped by the rate limiter.
+    Throttled, server and network errors are retried with exponential backoff;
+    TranslationError is raised once the retries are used up, or when a
+    successful response cannot be parsed.
+    """
+    # Imported on first use so commands that never translate start without it
+    import requests
+    
+    limiter = limiter or rate_limiter
+    http = session if session is not None else requests
+    
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        retry_after = None
+        start = time.perf_counter()
+        try:
+            if method == "post":
+                # Long batches would overflow the URL, so the text goes in the body
+                query = {k: v for k, v in params.items() if k != "q"}
+                response = http.post(TRANSLATE_URL, params=query, data={"q": params["q"]}, timeout=REQUEST_TIMEOUT)
+            else:
+                response = http.get(TRANSLATE_URL, params=params, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            metrics.observe("http_request_seconds", time.perf_counter() - start)
+            metrics.incr("http_requests", status="error")
+            error = str(e)
         else:
-            print(f"Translation request failed with status code {response.status_code} for '{text}'")
-            return text
+            metrics.observe("http_request_seconds", time.perf_counter() - start)
+            metrics.incr("http_requests", status=response.status_code)
+            if response.status_code == 200:
+                limiter.record_success()
+                try:
+                    return parse_translation_response(response.json())
+                except (ValueError, TypeError, IndexError, KeyError) as e:
+                    # A 200 with a body we cannot read fails like any other request
+                    raise TranslationError(f"Unexpected translation response: {e!r}") from e
+            error = f"status code {response.status_code}"
+            if response.status_code not in RETRY_STATUS_CODES:
+                break
+            retry_after = response.headers.get("Retry-After")
+        
+        if attempt < MAX_RETRIES:
+            limiter.backoff(attempt, retry_after)
+    
+    limiter.record_failure()
+    raise TranslationError(f"Translation request failed with {error}")
+
+def _build_params(text, target_lang):
+    # Use the free Google Translate API endpoint
+    return {
+        "client": "gtx",
+        "sl": "en",  # Source language
+        "tl": target_lang,  # Target language
+        "dt": "t",  # Return translated text
+        "q": text  # Text to translate
+    }
+
+def _mask(text):
+    """(masked text, protected spans) to send instead of text"""
+    if not MASK_PLACEHOLDERS:
+        return text, ()
+    return mask_text(text)
+
+def _placeholders_only(text):
+    """True for strings made only of placeholders and markup, which are kept as they are"""
+    masked, spans = _mask(text)
+    return bool(spans) and not needs_translation(masked)
+
+def _restore(translated, spans, target_lang):
+    """Put the protected spans back, rejecting translations that mangled them"""
+    if not spans:
+        return translated
+    try:
+        return restore_text(translated, spans)
+    except RestoreError as e:
+        metrics.incr("restore_failures")
+        raise TranslationError(f"Placeholders lost in translation to '{target_lang}': {e}") from e
+
+class GoogleTranslateBackend(TranslationBackend):
+    """The free translate_a/single endpoint at TRANSLATE_URL"""
+
+    name = "google"
+
+    def create_session(self, pool_size=MAX_CONCURRENT_REQUESTS):
+        return create_session(pool_size)
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        return _send_request(_build_params(text, target_lang), session, limiter)
+
+    def translate_batch(self, texts, target_lang, session=None, limiter=None):
+        """
+        Translate several single-line strings with one request.
+        Raises TranslationError if the response does not split back into
+        exactly one line per input string.
+        """
+        joined = BATCH_SEPARATOR.join(texts)
+        translated = _send_request(_build_params(joined, target_lang), session, limiter, method="post")
+        parts = translated.split(BATCH_SEPARATOR)
+        if len(parts) != len(texts):
+            raise TranslationError(f"Batch response has {len(parts)} lines for {len(texts)} strings")
+        return [part.strip() for part in parts]
+
+def create_backend(name=None):
+    """
+    Create the translation backend called name (default: BACKEND), wrapped in a
+    RecordingBackend when RECORD_FILE is set.
+    """
+    name = name or BACKEND
+    if name == 'google':
+        created = GoogleTranslateBackend()
+    elif name == 'echo':
+        created = EchoBackend()
+    elif name == 'replay':
+        if not REPLAY_FILE:
+            raise ValueError("The replay backend needs REPLAY_FILE")
+        created = ReplayBackend(REPLAY_FILE)
+    else:
+        raise ValueError(f"Unknown translation backend '{name}' (choose from google, echo, replay)")
+    if RECORD_FILE:
+        created = RecordingBackend(created, RECORD_FILE)
+    return created
+
+def get_backend():
+    """The backend in use, created from BACKEND the first time it is needed"""
+    global backend
+    if backend is None:
+        backend = create_backend()
+    return backend
+
+def _match_whitespace(source, translated):
+    """
+    Give a translation the leading and trailing whitespace of its source.
+    Single and batched requests return different surrounding whitespace
+    (batches are split on line breaks), so both are normalized the same way.
+    """
+    stripped = source.strip()
+    if not stripped:
+        return source
+    start = source.index(stripped)
+    return source[:start] + translated.strip() + source[start + len(stripped):]
+
+def request_translation(text, target_lang, session=None, limiter=None):
+    """Translate a single string, raising TranslationError if the request fails"""
+    if _placeholders_only(text):
+        return text  # Nothing to pay for
+    masked, spans = _mask(text)
+    translated = get_backend().translate(masked, target_lang, session, limiter)
+    return _match_whitespace(text, _restore(translated, spans, target_lang))
+
+def request_translation_batch(texts, target_lang, session=None, limiter=None):
+    """
+    Translate several single-line strings with one call to the backend.
+    Raises TranslationError if the call fails or does not return exactly one
+    translation per input string.
+    """
+    masks = [_mask(text) for text in texts]
+    translated = get_backend().translate_batch([masked for masked, _ in masks], target_lang, session, limiter)
+    if len(translated) != len(texts):
+        raise TranslationError(f"Batch response has {len(translated)} lines for {len(texts)} strings")
+    return [
+        _match_whitespace(text, _restore(part, spans, target_lang))
+        for text, part, (_, spans) in zip(texts, translated, masks)
+    ]
+
+def parse_translation_response(result):
+    """Join the translated segments of a translate_a/single response"""
+    translated_text = ''
+    # Extract all translated parts
+    for part in result[0]:
+        if part[0]:
+            translated_text += part[0]
+    
+    # Unescape HTML entities
+    return html.unescape(translated_text)
+
+def _translate_uncached(text, target_lang, session=None, limiter=None):
+    """
+    Request a translation and store it in the translation memory on success.
+    Returns None if it failed; the failure is recorded so it is retried next run.
+    """
+    journal = translation_journals.get(target_lang)
+    try:
+        translated_text = request_translation(text, target_lang, session, limiter)
     except Exception as e:
-        print(f"Translation failed for '{text}' to '{target_lang}': {e}")
-        return text  # fallback to original
+        log(f"Translation failed for '{text}' to '{target_lang}': {e}")
+        metrics.incr("strings_failed")
+        translation_failures.setdefault(target_lang, {})[text] = str(e)
+        if journal is not None:
+            journal.record_failure(text, e)
+        return None
+    if translation_memory is not None:
+        translation_memory.put(text, target_lang, translated_text)
+    if journal is not None:
+        journal.record(text, translated_text)
+    metrics.incr("strings_translated")
+    log(f"Translated '{text}' → '{translated_text}'")
+    return translated_text
 
 def load_base_language_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -65,58 +278,433 @@ def load_existing_translations(lang_code):
         print(f"Error loading existing translations for {lang_code}: {e}")
     return {}
 
-def translate_dict(base_dict, target_lang, existing_translations=None):
-    """Translate only fields that don't already have translations"""
-    if existing_translations is None:
-        existing_translations = {}
-    
+def source_hash(value):
+    """Short, stable hash of a base language value"""
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()[:16]
+
+def hash_catalog(data):
+    """Mirror a catalog with the source hash of every leaf value"""
+    return {
+        key: hash_catalog(value) if isinstance(value, dict) else source_hash(value)
+        for key, value in data.items()
+    }
+
+def load_manifest(lang_code):
+    """Load the source hashes recorded for a language, or None if it has no manifest yet"""
+    file_path = os.path.join(MANIFEST_DIR, f"{lang_code}.json")
+    if not os.path.exists(file_path):
+        return None
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading manifest for {lang_code}: {e}")
+        return None
+
+def save_manifest(lang_code, hashes):
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    file_path = os.path.join(MANIFEST_DIR, f"{lang_code}.json")
+    write_catalog(file_path, hashes)
+
+def manifest_hashes(base_dict, source_hashes, failed):
+    """
+    Drop the hashes of keys whose translation failed from a language's manifest,
+    so the next run sees them as outdated and retries them instead of keeping
+    the English fallback.
+    """
+    kept = {}
+    for key, value in source_hashes.items():
+        source = base_dict[key]
+        if isinstance(value, dict):
+            kept[key] = manifest_hashes(source, value, failed)
+        elif not (isinstance(source, str) and source in failed):
+            kept[key] = value
+    return kept
+
+def open_journal(lang_code):
+    """Open (or resume) the checkpoint journal of a language, if journaling is enabled"""
+    if not JOURNAL_DIR:
+        return None
+    journal = TranslationJournal(JOURNAL_DIR, lang_code)
+    if journal.resumed:
+        print(f"Resuming {lang_code}: {journal.resumed} strings recovered from an interrupted run")
+    translation_journals[lang_code] = journal
+    return journal
+
+def close_journal(lang_code, completed):
+    """
+    Close a language's journal. Once its file is saved (completed) the journal
+    is dropped; otherwise it is kept so the next run resumes from it.
+    """
+    journal = translation_journals.pop(lang_code, None)
+    if journal is None:
+        return
+    if completed:
+        journal.complete()
+    else:
+        journal.close()
+    if journal.failed:
+        print(f"{len(journal.failed)} strings failed for '{lang_code}': left out (or kept their previous "
+              f"translation) and retried next run (see {journal.failed_path})")
+
+def translate_dict(base_dict, target_lang, existing_translations=None, manifest=None, session=None):
+    """Translate only fields that don't already have an up-to-date translation"""
+    translated, pending = _collect_pending(base_dict, existing_translations or {}, manifest)
+    for targets, text in prepare_pending(pending, target_lang):
+        _fill_targets(targets, _translate_uncached(text, target_lang, session))
+    return _finish(translated)
+
+def _collect_pending(base, existing_translations, manifest=None):
+    """
+    Build the output for one language, keeping existing translations and
+    queueing strings that still need translating. Until it is translated, a
+    queued string keeps its previous (outdated) translation, or is
+    UNTRANSLATED if it has none, so a failed request never puts the source
+    text into the locale.
+
+    A manifest (see hash_catalog) marks which existing translations are still
+    current: keys whose source hash changed are queued again. Without a
+    manifest every existing translation is trusted.
+
+    Plural entries are compared as whole values, so a locale that already has
+    plural forms where the base language has a string or list keeps them;
+    any other existing value whose shape differs from the base is kept too.
+
+    Args:
+        base (Catalog or dict): The base language catalog; pass a Catalog
+                                (see catalog_utils.flatten_catalog) to reuse
+                                it across languages
+
+    Returns:
+        tuple: (translated, pending) - translated is a Catalog in base key order,
+               pending holds (container, key, text) items filled in later
+    """
+    if not isinstance(base, Catalog):
+        base = flatten_catalog(base)
+    existing = flatten_catalog(existing_translations, base.keys)
+    hashes = flatten_catalog(manifest, base.keys) if manifest is not None else None
+    # Keep the key positions stable; pending values are replaced once translated
+    translated = base.copy()
+    pending = []
+    for path, value in base.items():
+        current = existing.get(path, MISSING)
+        if current is not MISSING and isinstance(current, dict) != isinstance(value, dict):
+            translated[path] = current
+        elif is_plural_entry(value):
+            form_hashes = None
+            if hashes is not None:
+                form_hashes = hashes.get(path)
+                if not isinstance(form_hashes, dict):
+                    form_hashes = {}
+            existing_forms = current if current is not MISSING else {}
+            translated[path] = _collect_forms(value, existing_forms, form_hashes, pending)
+        elif current is not MISSING and (
+            hashes is None or isinstance(value, dict) or hashes.get(path) == source_hash(value)
+        ):
+            translated[path] = current
+        elif isinstance(value, str):
+            translated[path] = UNTRANSLATED if current is MISSING else current
+            pending.append((translated, path, value))
+    return translated, pending
+
+def _collect_forms(forms, existing_forms, form_hashes, pending):
+    """
+    The plural forms of one entry for a language: current translations are
+    kept and the other forms queued, like strings in _collect_pending.
+    Forms only the locale has (e.g. Polish "few") are kept as they are.
+    """
     translated = {}
-    for key, value in base_dict.items():
-        # Check if this key already has a translation
-        if key in existing_translations:
-            if isinstance(value, dict) and isinstance(existing_translations[key], dict):
-                # Recursively merge nested dictionaries
-                translated[key] = translate_dict(value, target_lang, existing_translations[key])
-            else:
-                # Use existing translation
-                translated[key] = existing_translations[key]
-                print(f"Using existing translation for '{key}'")
+    for form, text in forms.items():
+        current = existing_forms.get(form, MISSING)
+        if current is not MISSING and (form_hashes is None or form_hashes.get(form) == source_hash(text)):
+            translated[form] = current
         else:
-            # No existing translation, create a new one
-            if isinstance(value, dict):
-                translated[key] = translate_dict(value, target_lang, {})
-            elif isinstance(value, str):
-                translated[key] = translate_text(value, target_lang)
-            else:
-                translated[key] = value
+            translated[form] = UNTRANSLATED if current is MISSING else current
+            pending.append((translated, form, text))
+    for form, text in existing_forms.items():
+        translated.setdefault(form, text)
     return translated
 
+def _finish(translated):
+    """The nested output of a language, without the strings that could not be translated"""
+    for path, value in list(translated.items()):
+        if isinstance(value, dict) and any(form is UNTRANSLATED for form in value.values()):
+            for form in [form for form, text in value.items() if text is UNTRANSLATED]:
+                del value[form]
+            if not value:
+                value = UNTRANSLATED
+        if value is UNTRANSLATED:
+            translated.remove(path)
+    return translated.to_nested()
+
+def prepare_pending(pending, target_lang):
+    """
+    Resolve pending items from the translation memory and group the rest by
+    source text, so each distinct string is requested only once per language.
+
+    Returns:
+        list: (targets, text) items, where targets is a list of (container, key)
+    """
+    grouped = {}
+    for container, key, text in pending:
+        # Nothing to translate: these keep the source text
+        if not text or text.strip() == '' or _placeholders_only(text):
+            container[key] = text
+            continue
+        if text not in grouped:
+            grouped[text] = []
+        grouped[text].append((container, key))
+    
+    journal = translation_journals.get(target_lang)
+    remaining = []
+    for text, targets in grouped.items():
+        cached = journal.get(text) if journal is not None else None
+        if cached is not None:
+            metrics.incr("journal_hits")
+        elif translation_memory is not None:
+            cached = translation_memory.get(text, target_lang)
+            if cached is not None:
+                metrics.incr("memory_hits")
+        if cached is not None:
+            for container, key in targets:
+                container[key] = cached
+        else:
+            remaining.append((targets, text))
+    
+    duplicates = len(pending) - len(grouped)
+    if duplicates:
+        metrics.incr("duplicate_strings", duplicates)
+        log(f"Reusing {duplicates} duplicate strings for '{target_lang}'")
+    return remaining
+
+def make_batches(pending):
+    """
+    Group pending (targets, text) items into batches within
+    BATCH_MAX_CHARS / BATCH_MAX_ITEMS. Strings containing line breaks or
+    consisting only of whitespace cannot be split back reliably and get a
+    batch of their own.
+    """
+    batches = []
+    current = []
+    current_chars = 0
+    for item in pending:
+        text = item[1]
+        if BATCH_SEPARATOR in text or not text.strip() or len(text) >= BATCH_MAX_CHARS:
+            batches.append([item])
+            continue
+        if current and (current_chars + len(text) + 1 > BATCH_MAX_CHARS or len(current) >= BATCH_MAX_ITEMS):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(item)
+        current_chars += len(text) + 1
+    if current:
+        batches.append(current)
+    return batches
+
+def translate_batch(batch, target_lang, session=None, limiter=None):
+    """Translate one batch of pending items in place, falling back to one request per string"""
+    if len(batch) == 1:
+        targets, text = batch[0]
+        _fill_targets(targets, _translate_uncached(text, target_lang, session, limiter))
+        return
+    
+    texts = [text for _, text in batch]
+    try:
+        translations = request_translation_batch(texts, target_lang, session, limiter)
+    except Exception as e:  # Handled like single requests (see _translate_uncached)
+        metrics.incr("batches_split")
+        log(f"Batch of {len(batch)} strings to '{target_lang}' failed ({e}), translating one by one")
+        for targets, text in batch:
+            _fill_targets(targets, _translate_uncached(text, target_lang, session, limiter))
+        return
+    
+    journal = translation_journals.get(target_lang)
+    for (targets, text), translated_text in zip(batch, translations):
+        _fill_targets(targets, translated_text)
+        if translation_memory is not None:
+            translation_memory.put(text, target_lang, translated_text)
+        if journal is not None:
+            journal.record(text, translated_text)
+    metrics.incr("strings_translated", len(batch))
+    log(f"Translated batch of {len(batch)} strings to '{target_lang}'")
+
+def _fill_targets(targets, translated_text):
+    if translated_text is None:
+        return  # Failed: the targets keep their previous translation, if any
+    for container, key in targets:
+        container[key] = translated_text
+
+def translate_dict_batched(base_dict, target_lang, existing_translations=None, manifest=None, session=None):
+    """Translate only fields that don't already have an up-to-date translation, several strings per request"""
+    translated, pending = _collect_pending(base_dict, existing_translations or {}, manifest)
+    for batch in make_batches(prepare_pending(pending, target_lang)):
+        translate_batch(batch, target_lang, session)
+    return _finish(translated)
+
+async def translate_dict_async(base_dict, target_lang, existing_translations, manifest, session, semaphore, executor):
+    """Async counterpart of translate_dict; requests are bounded by the shared semaphore"""
+    translated, pending = _collect_pending(base_dict, existing_translations or {}, manifest)
+    loop = asyncio.get_running_loop()
+
+    async def run(batch):
+        async with semaphore:
+            await loop.run_in_executor(executor, translate_batch, batch, target_lang, session)
+
+    pending = prepare_pending(pending, target_lang)
+    batches = make_batches(pending) if BATCH_MODE else [[item] for item in pending]
+    await asyncio.gather(*(run(batch) for batch in batches))
+    return _finish(translated)
+
+async def translate_all_async(base_data, target_langs, max_concurrency=MAX_CONCURRENT_REQUESTS):
+    """
+    Translate base_data into every target language at once.
+    All (key, language) pairs share one pooled session and at most
+    max_concurrency requests are in flight at any time.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    session = get_backend().create_session(max_concurrency)
+    source_hashes = hash_catalog(base_data)
+    base = flatten_catalog(base_data)  # Flattened once, shared by every language
+
+    async def run_language(lang, executor):
+        with metrics.stage("read"):
+            existing_translations = load_existing_translations(lang)
+            manifest = load_manifest(lang)
+        if existing_translations:
+            print(f"Found existing translations for {lang}")
+        journal = open_journal(lang)
+        completed = False
+        try:
+            # Languages overlap, so this sums the wall time of each language's translation
+            with metrics.stage("translate"):
+                translated_data = await translate_dict_async(
+                    base, lang, existing_translations, manifest, session, semaphore, executor
+                )
+            failed = translation_failures.pop(lang, {})
+            hashes = manifest_hashes(base_data, source_hashes, failed) if failed else source_hashes
+            if failed and journal is None:
+                print(f"{len(failed)} strings failed for '{lang}': left out (or kept their previous "
+                      f"translation) and retried next run")
+            with metrics.stage("write"):
+                save_if_changed(lang, translated_data, existing_translations, manifest, hashes)
+            completed = True
+        finally:
+            close_journal(lang, completed)
+
+    # The requests library is blocking, so each request runs on a worker thread
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        try:
+            await asyncio.gather(*(run_language(lang, executor) for lang in target_langs))
+        finally:
+            if session is not None:
+                session.close()
+
 def save_translation_file(lang_code, data):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     file_path = os.path.join(OUTPUT_DIR, f"{lang_code}.json")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_catalog(file_path, data)
+    if COMPILE_BINARY:
+        compile_catalog(data, os.path.join(OUTPUT_DIR, f"{lang_code}{BINARY_EXTENSION}"))
 
-def main():
-    base_data = load_base_language_file(BASE_LANG_FILE)
-    
-    for lang in TARGET_LANGS:
+def save_if_changed(lang_code, data, existing_translations, manifest, source_hashes):
+    """Save a locale and its manifest, leaving both untouched if nothing changed"""
+    if data == existing_translations and manifest == source_hashes:
+        print(f"\n{lang_code}.json is up to date, skipped.")
+        return False
+    save_translation_file(lang_code, data)
+    save_manifest(lang_code, source_hashes)
+    print(f"\n{lang_code}.json saved.")
+    return True
+
+def translate_all(base_data, target_langs):
+    """Translate base_data into each target language, one language at a time"""
+    source_hashes = hash_catalog(base_data)
+    base = flatten_catalog(base_data)  # Flattened once, shared by every language
+    for lang in target_langs:
         print(f"\nProcessing {lang}...")
         
         # Load existing translations if available
-        existing_translations = load_existing_translations(lang)
+        with metrics.stage("read"):
+            existing_translations = load_existing_translations(lang)
+            manifest = load_manifest(lang)
         if existing_translations:
             print(f"Found existing translations for {lang}")
         
-        # Only translate what's missing
-        translated_data = translate_dict(base_data, lang, existing_translations)
-        
-        # Save the updated translations
-        save_translation_file(lang, translated_data)
-        print(f"\n{lang}.json saved.")
-        
-        # Add a delay between languages to avoid rate limiting
-        time.sleep(2)
+        # Only translate what's missing or whose English source changed
+        journal = open_journal(lang)
+        completed = False
+        try:
+            with metrics.stage("translate"):
+                if BATCH_MODE:
+                    translated_data = translate_dict_batched(base, lang, existing_translations, manifest)
+                else:
+                    translated_data = translate_dict(base, lang, existing_translations, manifest)
+            
+            # Save the updated translations; failed keys stay out of the manifest so they are retried
+            failed = translation_failures.pop(lang, {})
+            hashes = manifest_hashes(base_data, source_hashes, failed) if failed else source_hashes
+            if failed and journal is None:
+                print(f"{len(failed)} strings failed for '{lang}': left out (or kept their previous "
+                      f"translation) and retried next run")
+            with metrics.stage("write"):
+                save_if_changed(lang, translated_data, existing_translations, manifest, hashes)
+            completed = True
+        finally:
+            close_journal(lang, completed)
+
+def set_output_dir(directory):
+    """Write the catalogs, and keep the manifests, journals and translation memory, under directory"""
+    global OUTPUT_DIR, TRANSLATION_MEMORY_FILE, MANIFEST_DIR, JOURNAL_DIR
+    OUTPUT_DIR = directory
+    if TRANSLATION_MEMORY_FILE:
+        TRANSLATION_MEMORY_FILE = os.path.join(directory, '.translation_memory.sqlite')
+    MANIFEST_DIR = os.path.join(directory, '.manifest')
+    if JOURNAL_DIR:
+        JOURNAL_DIR = os.path.join(directory, '.journal')
+
+def main(output_dir=None):
+    """
+    Translate the base catalog into every target language.
+
+    Args:
+        output_dir (str, optional): Directory to write to instead of OUTPUT_DIR.
+                                    Offline backends default to OFFLINE_OUTPUT_DIR,
+                                    so their stand-in translations never reach the
+                                    real catalogs, manifests or translation memory
+    """
+    global translation_memory, backend
+    if output_dir is None and BACKEND in OFFLINE_BACKENDS:
+        output_dir = OFFLINE_OUTPUT_DIR
+        print(f"The '{BACKEND}' backend writes to '{output_dir}' (pass an output directory to change it)")
+    if output_dir is not None:
+        set_output_dir(output_dir)
+    with metrics.stage("read"):
+        base_data = load_base_language_file(BASE_LANG_FILE)
+    
+    backend = create_backend()
+    print(f"Translating with the '{backend.name}' backend")
+    if TRANSLATION_MEMORY_FILE:
+        translation_memory = TranslationMemory(TRANSLATION_MEMORY_FILE)
+    try:
+        if ASYNC_MODE:
+            asyncio.run(translate_all_async(base_data, TARGET_LANGS))
+        else:
+            translate_all(base_data, TARGET_LANGS)
+    finally:
+        # Languages still open were interrupted; their journals are kept for the next run
+        for lang in list(translation_journals):
+            close_journal(lang, completed=False)
+        rate_limiter.report()
+        if translation_memory is not None:
+            translation_memory.report()
+            translation_memory.close()
+            translation_memory = None
+        backend.close()
+        backend = None
+        finish_run(METRICS_FILE, "TRANSLATION METRICS")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,235 @@
+import argparse
+import json
+from pathlib import Path
+from parallel import run_parallel
+from catalog_writer import write_json_atomic
+from catalog_utils import diff_catalogs, diff_counts
+from metrics import metrics, log
+
+def merge_append(data1, data2):
+    """
+    Merge two JSON data structures.
+    If both are dicts, merge them recursively.
+    If both are lists, concatenate them.
+    Otherwise, return a list containing both items.
+    """
+
+    if isinstance(data1, dict) and isinstance(data2, dict):
+        # Merge dictionaries
+        merged = data1.copy()
+        for key, value in data2.items():
+            if key in merged:
+                # If key exists in both, merge the values recursively
+                merged[key] = merge_append(merged[key], value)
+            else:
+                # If key doesn't exist in first dict, add it
+                merged[key] = value
+        return merged
+
+    elif isinstance(data1, list) and isinstance(data2, list):
+        # Concatenate lists
+        return data1 + data2
+
+    else:
+        # For other types, create a list with both values
+        return [data1, data2]
+
+def merge_overwrite(data1, data2):
+    """
+    Merge two JSON data structures by overwriting common top-level keys with the value from data2.
+    Lists are concatenated; for any other combination data2 wins.
+    """
+
+    if isinstance(data1, dict) and isinstance(data2, dict):
+        # Merge dictionaries by overwriting common keys with data2
+        merged = data1.copy()
+        for key, value in data2.items():
+            merged[key] = value  # Overwrite with new value
+        return merged
+
+    elif isinstance(data1, list) and isinstance(data2, list):
+        # Concatenate lists (if they are lists)
+        return data1 + data2
+
+    else:
+        return data2
+
+def merge_deep_overwrite(data1, data2):
+    """
+    Merge two JSON data structures recursively, with data2 winning for every leaf.
+    Unlike merge_overwrite, nested sections keep the keys data2 does not mention.
+    """
+
+    if isinstance(data1, dict) and isinstance(data2, dict):
+        merged = data1.copy()
+        for key, value in data2.items():
+            if key in merged:
+                merged[key] = merge_deep_overwrite(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
+
+    return data2
+
+STRATEGIES = {
+    "append": merge_append,
+    "overwrite": merge_overwrite,
+    "deep-overwrite": merge_deep_overwrite,
+}
+
+def _merge_layered_file(task):
+    """
+    Fold every overlay of one file into its base and write the result once,
+    only if it differs from what is already there.
+    Returns (filename, status, message, changes); status is 'merged', 'unchanged',
+    'would-merge' (dry run) or 'error', and changes is the diff_catalogs result
+    against the current output in a dry run, None otherwise.
+    """
+    filename, base_file, overlay_files, output_file, in_place, strategy, dry_run = task
+    merge = STRATEGIES[strategy]
+    try:
+        with open(base_file, 'r', encoding='utf-8') as f:
+            base_data = json.load(f)
+
+        # Apply the overlays in order, each read exactly once
+        merged_data = base_data
+        for overlay_file in overlay_files:
+            with open(overlay_file, 'r', encoding='utf-8') as f:
+                merged_data = merge(merged_data, json.load(f))
+
+        # Skip the write when the overlays add nothing new
+        if in_place:
+            existing = base_data
+        elif output_file.exists():
+            with open(output_file, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        else:
+            existing = None
+        if merged_data == existing:
+            return filename, "unchanged", f"  = {filename} already up to date", None
+
+        if dry_run:
+            changes = diff_catalogs(existing, merged_data)
+            return filename, "would-merge", f"  ~ {filename} would change: {diff_counts(changes)}", changes
+
+        write_json_atomic(output_file, merged_data)
+
+        return filename, "merged", f"  ✓ Successfully merged {filename} ({len(overlay_files)} overlays)", None
+
+    except json.JSONDecodeError as e:
+        return filename, "error", f"  ✗ Error reading JSON from {filename}: {e}", None
+    except Exception as e:
+        return filename, "error", f"  ✗ Error processing {filename}: {e}", None
+
+def scan_folders(base_folder, other_folders):
+    """
+    Index the JSON files of a base folder and of the folders compared with or
+    merged onto it.
+
+    Returns:
+        tuple: ({name: path} for the base, [{name: path}] per other folder,
+                sorted names present in the base and at least one other folder)
+    """
+    base_files = {f.name: f for f in Path(base_folder).glob("*.json")}
+    other_files = [{f.name: f for f in Path(folder).glob("*.json")} for folder in other_folders]
+    common_files = sorted(
+        name for name in base_files
+        if any(name in files for files in other_files)
+    )
+    return base_files, other_files, common_files
+
+def merge_layers(base_folder, overlay_folders, strategy="append", output_folder=None, workers=1, use_threads=False,
+                 dry_run=False):
+    """
+    Merge an ordered list of overlay folders onto a base folder in a single pass.
+
+    Every JSON file in the base folder that also appears in at least one overlay
+    is loaded once, has the overlays applied in order (later folders win) and is
+    written once, so N deltas cost one pass instead of N two-folder merges.
+
+    Args:
+        base_folder (str): Folder with the current translations (e.g. translations_D4)
+        overlay_folders (list): Folders to apply on top, oldest first
+        strategy (str): 'append', 'overwrite' or 'deep-overwrite' (see STRATEGIES)
+        output_folder (str, optional): Path to output folder. If None, overwrites base files.
+        workers (int): Number of files merged in parallel
+        use_threads (bool): Use threads instead of processes for the workers
+        dry_run (bool): Report what would change (see catalog_utils.diff_catalogs)
+                        without writing anything
+
+    Returns:
+        list: (filename, status, message, changes) for every merged file
+    """
+    if strategy not in STRATEGIES:
+        print(f"Error: Unknown merge strategy '{strategy}' (choose from {', '.join(STRATEGIES)})")
+        return []
+
+    base = Path(base_folder)
+    overlays = [Path(folder) for folder in overlay_folders]
+
+    # Check if folders exist
+    for folder in [base] + overlays:
+        if not folder.exists():
+            print(f"Error: Folder '{folder}' does not exist!")
+            return []
+
+    # Create output folder if specified
+    if output_folder:
+        output_path = Path(output_folder)
+        if not dry_run:
+            output_path.mkdir(parents=True, exist_ok=True)
+    else:
+        output_path = base
+
+    # Find files present in the base and in at least one overlay
+    base_files, overlay_files, common_files = scan_folders(base, overlays)
+
+    if not common_files:
+        print("No common JSON files found between the base and overlay folders.")
+        return []
+
+    print(f"Found {len(common_files)} common JSON files to merge:")
+    for filename in common_files:
+        log(f"  - {filename}")
+
+    tasks = [
+        (
+            filename,
+            base_files[filename],
+            [files[filename] for files in overlay_files if filename in files],
+            output_path / filename,
+            output_path == base,
+            strategy,
+            dry_run,
+        )
+        for filename in common_files
+    ]
+    with metrics.stage("merge"):
+        results = run_parallel(_merge_layered_file, tasks, workers, use_threads)
+
+    merged_count = 0
+    for filename, status, message, changes in results:
+        metrics.incr("files_merged", status=status)
+        log(f"\nMerging {filename}...")
+        # Errors are shown even in quiet mode
+        (print if status == "error" else log)(message)
+        if status in ("merged", "would-merge"):
+            merged_count += 1
+
+    if dry_run:
+        print(f"\nDry run: {merged_count} of {len(results)} files would be updated in: {output_path}")
+    else:
+        print(f"\nMerging complete! {merged_count} of {len(results)} files updated in: {output_path}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge several translation folders onto a base folder in one pass")
+    parser.add_argument("base_folder", help="Folder with the current translations")
+    parser.add_argument("overlay_folders", nargs="+", help="Folders to apply on top, oldest first")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="append")
+    parser.add_argument("--output", help="Output folder (default: overwrite the base folder)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of files merged in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change without writing")
+    args = parser.parse_args()
+
+    merge_layers(args.base_folder, args.overlay_folders, args.strategy, args.output, args.workers, dry_run=args.dry_run)
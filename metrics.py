@@ -0,0 +1,181 @@
+"""
+Run metrics for the conversion, merge and translation pipelines.
+
+Counters, latency histograms and per-stage timers are collected in a
+Metrics registry instead of being printed item by item. At the end of a
+run the registry prints a summary, or is exported as JSON or as a
+Prometheus text file (node_exporter textfile collector format).
+
+Workers running in other processes record into their own Metrics and
+return snapshot(); the parent folds them in with merge().
+"""
+import bisect
+import contextlib
+import json
+import threading
+import time
+
+PREFIX = "localization"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # Seconds
+QUIET = False  # Suppress per-item progress messages (see log)
+
+def log(message):
+    """Print a per-item progress message unless quiet mode is on"""
+    if not QUIET:
+        print(message)
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key):
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in key) + "}"
+
+class Metrics:
+    """Thread-safe registry of counters, histograms and stage timers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # name -> [bucket counts..., +Inf count, sum]
+        self.stages = {}  # stage -> [seconds, runs]
+
+    def incr(self, name, amount=1, **labels):
+        """Add amount to a counter, e.g. incr("http_requests", status=200)"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS):
+        """Record one observation (e.g. a request latency in seconds) in a histogram"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = [0] * (len(buckets) + 1) + [0.0]
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+
+    def add_stage_time(self, stage, seconds, runs=1):
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += runs
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a pipeline stage (read, transform, serialize, write, ...)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        """Picklable copy of everything recorded, for returning from a worker"""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: list(values) for name, values in self.histograms.items()},
+                "stages": {name: list(values) for name, values in self.stages.items()},
+            }
+
+    def merge(self, snapshot):
+        """Fold a snapshot() taken in a worker into this registry"""
+        with self._lock:
+            for key, value in snapshot["counters"].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for name, values in snapshot["histograms"].items():
+                histogram = self.histograms.setdefault(name, [0] * (len(values) - 1) + [0.0])
+                for i, value in enumerate(values):
+                    histogram[i] += value
+            for name, (seconds, runs) in snapshot["stages"].items():
+                totals = self.stages.setdefault(name, [0.0, 0])
+                totals[0] += seconds
+                totals[1] += runs
+
+    def percentile(self, name, fraction, buckets=LATENCY_BUCKETS):
+        """Upper bound of the bucket holding the given fraction of observations"""
+        histogram = self.histograms.get(name)
+        if not histogram:
+            return None
+        total = sum(histogram[:-1])
+        if not total:
+            return None
+        running = 0
+        for i, count in enumerate(histogram[:-1]):
+            running += count
+            if running >= fraction * total:
+                return buckets[i] if i < len(buckets) else float("inf")
+
+    def report(self, title="RUN METRICS"):
+        """Print a summary of the run"""
+        print(f"\n=== {title} ===")
+        for name, (seconds, runs) in sorted(self.stages.items()):
+            print(f"Stage {name}: {seconds:.3f}s over {runs} runs")
+        for (name, labels), value in sorted(self.counters.items()):
+            print(f"{name}{_format_labels(labels)}: {value}")
+        for name, histogram in sorted(self.histograms.items()):
+            count = sum(histogram[:-1])
+            mean = histogram[-1] / count if count else 0.0
+            print(
+                f"{name}: {count} observations, mean {mean:.3f}s, "
+                f"p50 <= {self.percentile(name, 0.5)}s, p95 <= {self.percentile(name, 0.95)}s"
+            )
+
+    def to_prometheus(self, buckets=LATENCY_BUCKETS):
+        """Render the registry in the Prometheus text exposition format"""
+        lines = []
+        typed = set()
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = f"{PREFIX}_{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            running = 0
+            for bound, count in zip(list(buckets) + ["+Inf"], histogram[:-1]):
+                running += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {running}')
+            lines.append(f"{metric}_sum {histogram[-1]}")
+            lines.append(f"{metric}_count {running}")
+        if self.stages:
+            lines.append(f"# TYPE {PREFIX}_stage_seconds_total counter")
+            for name, (seconds, _) in sorted(self.stages.items()):
+                lines.append(f'{PREFIX}_stage_seconds_total{{stage="{name}"}} {seconds}')
+            lines.append(f"# TYPE {PREFIX}_stage_runs_total counter")
+            for name, (_, runs) in sorted(self.stages.items()):
+                lines.append(f'{PREFIX}_stage_runs_total{{stage="{name}"}} {runs}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write the metrics to path: JSON for *.json, Prometheus text otherwise"""
+        if str(path).endswith(".json"):
+            data = {
+                "counters": {f"{name}{_format_labels(labels)}": value for (name, labels), value in self.counters.items()},
+                "histograms": self.histograms,
+                "stages": {name: {"seconds": seconds, "runs": runs} for name, (seconds, runs) in self.stages.items()},
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.stages.clear()
+
+metrics = Metrics()  # Registry shared by everything running in this process
+
+def finish_run(path=None, title="RUN METRICS"):
+    """Print the run summary and, if a path is given, export the metrics there"""
+    metrics.report(title)
+    if path:
+        metrics.export(path)
+        print(f"Metrics written to {path}")
@@ -0,0 +1,28 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+def run_parallel(func, items, workers=1, use_threads=False, initializer=None, initargs=()):
+    """
+    Apply func to every item, optionally across a pool of workers.
+
+    Args:
+        func (callable): Module-level function taking one item (must be picklable for processes)
+        items (iterable): Work items
+        workers (int): Number of workers. 1 runs everything in the current process
+        use_threads (bool): Use a thread pool instead of a process pool
+        initializer (callable, optional): Run once per worker before any item,
+                                          e.g. to hand over data shared by all items
+        initargs (tuple): Arguments for initializer
+
+    Returns:
+        list: Results in the same order as items
+    """
+    items = list(items)
+    if workers is None or workers <= 1 or len(items) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(item) for item in items]
+
+    workers = min(workers, len(items))
+    pool_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with pool_class(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, items))
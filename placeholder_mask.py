@@ -0,0 +1,81 @@
+"""
+Protect placeholders and markup from machine translation.
+
+Before a string is sent, every interpolation token ({count}, {{name}}, %s,
+%1$d), HTML tag and entity is replaced by a numbered marker the endpoint
+leaves alone (⟦0⟧, ⟦1⟧, ...). After translation the markers are swapped
+back for the original spans. A translation that lost, duplicated or
+invented a marker cannot be restored safely and is rejected.
+
+Masking depends only on the source string, so it is computed once and
+reused for every target language.
+"""
+import functools
+import re
+from catalog_validator import PLACEHOLDER_PATTERN
+
+MASK_CACHE_SIZE = 65536  # Distinct source strings whose masks are kept
+MARKER_OPEN = "⟦"
+MARKER_CLOSE = "⟧"
+
+# Markers as they come back; translators sometimes add spaces inside them
+MARKER_PATTERN = re.compile(rf"{MARKER_OPEN}\s*(\d+)\s*{MARKER_CLOSE}")
+# Spans to protect: placeholders, HTML tags, entities and marker look-alikes already in the source
+PROTECTED_PATTERN = re.compile(
+    rf"{PLACEHOLDER_PATTERN.pattern}"
+    r"|<\s*/?\s*[a-zA-Z][^<>]*>"
+    r"|&(?:[a-zA-Z]+|#\d+|#x[0-9a-fA-F]+);"
+    rf"|{MARKER_OPEN}[^{MARKER_CLOSE}]*{MARKER_CLOSE}"
+)
+_WORD_PATTERN = re.compile(r"[^\W\d_]")
+
+class RestoreError(ValueError):
+    """Raised when the placeholders of a translation cannot be put back"""
+
+@functools.lru_cache(maxsize=MASK_CACHE_SIZE)
+def mask_text(text):
+    """
+    Replace the protected spans of text by numbered markers.
+
+    Returns:
+        tuple: (masked text, tuple of the original spans, by marker number)
+    """
+    spans = []
+
+    def replace(match):
+        spans.append(match.group(0))
+        return f"{MARKER_OPEN}{len(spans) - 1}{MARKER_CLOSE}"
+
+    masked = PROTECTED_PATTERN.sub(replace, text)
+    return masked, tuple(spans)
+
+def needs_translation(masked):
+    """False when nothing but markers, digits and punctuation is left to translate"""
+    return _WORD_PATTERN.search(MARKER_PATTERN.sub("", masked)) is not None
+
+def restore_text(translated, spans):
+    """
+    Put the original spans back into a translated masked string.
+    Raises RestoreError unless every marker comes back exactly once.
+    """
+    if not spans:
+        if MARKER_OPEN in translated or MARKER_CLOSE in translated:
+            raise RestoreError(f"Unexpected marker in {translated!r}")
+        return translated
+
+    seen = []
+
+    def replace(match):
+        index = int(match.group(1))
+        if index >= len(spans):
+            raise RestoreError(f"Unknown marker {match.group(0)} in {translated!r}")
+        seen.append(index)
+        return spans[index]
+
+    restored = MARKER_PATTERN.sub(replace, translated)
+    if sorted(seen) != list(range(len(spans))):
+        raise RestoreError(f"Expected markers 0-{len(spans) - 1} once each, got {sorted(seen)} in {translated!r}")
+    leftover = MARKER_PATTERN.sub("", translated)
+    if MARKER_OPEN in leftover or MARKER_CLOSE in leftover:
+        raise RestoreError(f"Mangled marker in {translated!r}")
+    return restored
@@ -0,0 +1,105 @@
+import random
+import threading
+import time
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that shapes outgoing requests per second.
+
+    When the endpoint starts throttling (429) or failing (5xx), backoff()
+    sleeps with exponential delay and halves the request rate; every
+    successful request then nudges the rate back up towards the configured
+    maximum. Time spent waiting is tracked so runs can report it.
+    """
+
+    def __init__(self, rate=2.0, burst=5, min_rate=0.1, backoff_base=1.0, backoff_max=60.0):
+        """
+        Args:
+            rate (float): Maximum requests per second
+            burst (int): Number of requests that may be sent back to back
+            min_rate (float): Lower bound the adaptive rate can drop to
+            backoff_base (float): Delay in seconds before the first retry
+            backoff_max (float): Upper bound for a single backoff delay
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttle_seconds = 0.0
+        self.backoff_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            with self._lock:
+                self.throttle_seconds += wait
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Sleep before retry number `attempt` (0-based) and slow the request rate down.
+
+        Args:
+            attempt (int): How many retries have already been made for this request
+            retry_after (str, optional): Value of the Retry-After header, if any
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.retries += 1
+
+        delay = None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = None
+        if delay is None:
+            # Full jitter keeps concurrent workers from retrying in lockstep
+            delay = random.uniform(0.5, 1.0) * self.backoff_base * (2 ** attempt)
+        delay = min(delay, self.backoff_max)
+
+        time.sleep(delay)
+        with self._lock:
+            self.backoff_seconds += delay
+
+    def record_success(self):
+        """Gradually restore the request rate after throttling"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate * 1.1)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def report(self):
+        """Print how much wall time went to throttling"""
+        print("\n=== RATE LIMITER ===")
+        print(f"Requests sent: {self.requests}")
+        print(f"Retries: {self.retries}")
+        print(f"Failed after retries: {self.failures}")
+        print(f"Time waiting for rate limit (summed over workers): {self.throttle_seconds:.1f}s")
+        print(f"Time backing off after errors (summed over workers): {self.backoff_seconds:.1f}s")
+        print(f"Current rate: {self.rate:.2f} requests/s (max {self.max_rate:.2f})")
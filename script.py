@@ -1,29 +1,221 @@
-import pandas as pd
 import json
 import os
+from parallel import run_parallel
+from catalog_writer import IncrementalJsonWriter, write_catalog
+from catalog_binary import compile_catalog, compile_json_file, EXTENSION as BINARY_EXTENSION
+from catalog_validator import validate_catalogs, print_report
+from metrics import Metrics, metrics, log
 
-def convert_sheet_to_json_files(file_path, output_directory="translations"):
+# Data shared by every language column, handed to each worker once
+_shared_keys = None
+_shared_output_directory = None
+_shared_compile_binary = False
+
+def _init_language_worker(keys, output_directory, compile_binary=False):
+    global _shared_keys, _shared_output_directory, _shared_compile_binary
+    _shared_keys = keys
+    _shared_output_directory = output_directory
+    _shared_compile_binary = compile_binary
+
+def build_language_dict(keys, values):
+    """
+    Build the translations of one language column without iterating rows in Python.
+    
+    Args:
+        keys (pd.Series): Key column
+        values (pd.Series): Language column, aligned with keys
+    
+    Returns:
+        tuple: (dict of key -> cleaned value, index labels of skipped rows)
+    """
+    # Skip if key or value is empty/NaN
+    mask = keys.notna() & (keys != '') & values.notna() & (values != '')
+    
+    # Clean up the values (remove extra whitespace, handle line breaks)
+    cleaned_keys = keys[mask].astype(str)
+    cleaned_values = values[mask].astype(str).str.strip()
+    json_data = dict(zip(cleaned_keys, cleaned_values))
+    
+    return json_data, values.index[~mask]
+
+def read_sheet(file_path):
+    """Read an Excel/CSV export of the translation sheet into a DataFrame"""
+    import pandas as pd
+    
+    if file_path.endswith('.xlsx'):
+        return pd.read_excel(file_path)
+    elif file_path.endswith('.csv'):
+        return pd.read_csv(file_path)
+    raise ValueError("File must be .xlsx or .csv format")
+
+def _format_skipped(skipped, limit=10):
+    rows = ", ".join(str(index) for index in skipped[:limit])
+    if len(skipped) > limit:
+        rows += ", ..."
+    return f"  Skipped {len(skipped)} empty rows: {rows}"
+
+def _write_language_file(task):
+    """
+    Build and write the JSON file for one language column.
+    Runs in a worker, so messages and metrics are collected and reported by the caller.
+    """
+    lang_code, values = task
+    messages = []
+    task_metrics = Metrics()
+    
+    # Create JSON object for this language
+    with task_metrics.stage("transform"):
+        json_data, skipped = build_language_dict(_shared_keys, values)
+    if len(skipped):
+        task_metrics.incr("rows_skipped", len(skipped))
+        messages.append(_format_skipped(skipped))
+    
+    # Generate filename
+    filename = f"{lang_code}.json"
+    filepath = os.path.join(_shared_output_directory, filename)
+    
+    # Write JSON file
+    try:
+        # Serializing and writing happen together, so they are timed as one stage
+        with task_metrics.stage("write"):
+            write_catalog(filepath, json_data)
+        if _shared_compile_binary:
+            with task_metrics.stage("compile"):
+                compile_catalog(json_data, os.path.join(_shared_output_directory, f"{lang_code}{BINARY_EXTENSION}"))
+        
+        task_metrics.incr("files_written")
+        task_metrics.incr("keys_written", len(json_data))
+        messages.append(f"  ✓ Created: {filepath} ({len(json_data)} translations)")
+        
+    except Exception as e:
+        task_metrics.incr("files_failed")
+        messages.append(f"  ✗ Error creating {filepath}: {e}")
+    
+    return lang_code, messages, task_metrics.snapshot()
+
+def _convert_csv_in_chunks(file_path, output_directory, chunksize, compile_binary=False):
+    """
+    Stream a CSV export into one incremental JSON writer per language,
+    reading chunksize rows at a time so peak memory does not depend on
+    the number of rows.
+    
+    Returns:
+        bool: True if the files were written, False if the file could not be read
+    """
+    import pandas as pd
+    
+    try:
+        chunks = pd.read_csv(file_path, chunksize=chunksize)
+        with metrics.stage("read"):
+            first_chunk = next(chunks, None)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return False
+    if first_chunk is None:
+        print(f"Error reading file: {file_path} has no rows")
+        return False
+    
+    print(f"Streaming file: {file_path} ({chunksize} rows per chunk)")
+    
+    # Get column names (language codes)
+    columns = first_chunk.columns.tolist()
+    key_column = columns[0]  # First column contains keys
+    language_columns = columns[1:]  # Rest are language columns
+    
+    print(f"Key column: {key_column}")
+    print(f"Language columns: {language_columns}")
+    
+    writers = {}
+    skipped = {}
+    for lang_code in language_columns:
+        if pd.isna(lang_code) or lang_code == '':
+            print(f"Skipping empty column")
+            continue
+        # Written to temporary files until every chunk has parsed, so a bad row
+        # near the end cannot leave truncated <lang>.json files behind
+        writers[lang_code] = IncrementalJsonWriter(os.path.join(output_directory, f"{lang_code}.json"), atomic=True)
+        skipped[lang_code] = []
+    
+    row_count = 0
+    try:
+        chunk = first_chunk
+        while chunk is not None:
+            keys = chunk[key_column]
+            for lang_code, writer in writers.items():
+                with metrics.stage("transform"):
+                    json_data, skipped_rows = build_language_dict(keys, chunk[lang_code])
+                with metrics.stage("write"):
+                    for key, value in json_data.items():
+                        writer.write(key, value)
+                skipped[lang_code].extend(skipped_rows)
+            row_count += len(chunk)
+            with metrics.stage("read"):
+                chunk = next(chunks, None)
+    except Exception as e:
+        for writer in writers.values():
+            writer.discard()
+        print(f"  ✗ Error reading {file_path} after {row_count} rows: {e}")
+        print("Nothing written: fix the file and run again.")
+        return False
+    except BaseException:
+        for writer in writers.values():
+            writer.discard()
+        raise
+    for writer in writers.values():
+        writer.close()
+    
+    if compile_binary:
+        # Compiled from the written files, so memory stays bounded by the largest locale
+        with metrics.stage("compile"):
+            for writer in writers.values():
+                compile_json_file(writer.path)
+    
+    print(f"Sheet dimensions: ({row_count}, {len(columns)})")
+    for lang_code, writer in writers.items():
+        metrics.incr("files_written")
+        metrics.incr("keys_written", writer.count)
+        log(f"\nProcessing language: {lang_code}")
+        if skipped[lang_code]:
+            metrics.incr("rows_skipped", len(skipped[lang_code]))
+            log(_format_skipped(skipped[lang_code]))
+        log(f"  ✓ Created: {writer.path} ({writer.count} translations)")
+    return True
+
+def convert_sheet_to_json_files(file_path, output_directory="translations", workers=1, use_threads=False,
+                                chunksize=None, compile_binary=False):
     """
     Convert Google Sheet with translations to individual JSON files for each language
     
     Args:
         file_path (str): Path to the Excel/CSV file from Google Sheets
         output_directory (str): Directory to save JSON files
+        workers (int): Number of languages built and written in parallel
+        use_threads (bool): Use threads instead of processes for the workers
+        chunksize (int, optional): For CSV files, stream this many rows at a time
+                                   instead of loading the whole file. Column types
+                                   are inferred per chunk, so numeric columns with
+                                   gaps may render differently (3 vs 3.0); text
+                                   columns are byte-identical
+        compile_binary (bool): Also write a binary <lang>.lcat catalog for each
+                               language (see catalog_binary)
     """
+    # pandas takes most of a second to import, so only commands that read sheets pay for it
+    import pandas as pd
     
     # Create output directory if it doesn't exist
     if not os.path.exists(output_directory):
         os.makedirs(output_directory)
         print(f"Created directory: {output_directory}")
     
+    if chunksize and file_path.endswith('.csv'):
+        if _convert_csv_in_chunks(file_path, output_directory, chunksize, compile_binary):
+            print(f"\n🎉 Translation files created in '{output_directory}' directory")
+        return
+    
     # Read the file (works with both .xlsx and .csv)
     try:
-        if file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
-        elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            raise ValueError("File must be .xlsx or .csv format")
+        with metrics.stage("read"):
+            df = read_sheet(file_path)
             
         print(f"Successfully loaded file: {file_path}")
         print(f"Sheet dimensions: {df.shape}")
@@ -41,59 +233,44 @@ def convert_sheet_to_json_files(file_path, output_directory="translations"):
     print(f"Language columns: {language_columns}")
     
     # Process each language column
+    tasks = []
     for lang_code in language_columns:
         if pd.isna(lang_code) or lang_code == '':
             print(f"Skipping empty column")
             continue
-            
-        print(f"\nProcessing language: {lang_code}")
-        
-        # Create JSON object for this language
-        json_data = {}
-        
-        # Iterate through rows
-        for index, row in df.iterrows():
-            key = row[key_column]
-            value = row[lang_code]
-            
-            # Skip if key or value is empty/NaN
-            if pd.isna(key) or pd.isna(value) or key == '' or value == '':
-                print(f"  Skipping empty row {index}: key='{key}', value='{value}'")
-                continue
-            
-            # Clean up the value (remove extra whitespace, handle line breaks)
-            cleaned_value = str(value).strip()
-            json_data[str(key)] = cleaned_value
-        
-        # Generate filename
-        filename = f"{lang_code}.json"
-        filepath = os.path.join(output_directory, filename)
-        
-        # Write JSON file
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"  ✓ Created: {filepath} ({len(json_data)} translations)")
-            
-        except Exception as e:
-            print(f"  ✗ Error creating {filepath}: {e}")
+        tasks.append((lang_code, df[lang_code]))
+    
+    # The sheet is parsed once; the key column goes to each worker only once
+    keys = df[key_column]
+    results = run_parallel(
+        _write_language_file, tasks, workers, use_threads,
+        initializer=_init_language_worker, initargs=(keys, output_directory, compile_binary)
+    )
+    for lang_code, messages, task_metrics in results:
+        metrics.merge(task_metrics)
+        log(f"\nProcessing language: {lang_code}")
+        for message in messages:
+            # Errors are shown even in quiet mode
+            (print if "✗" in message else log)(message)
     
     print(f"\n🎉 Translation files created in '{output_directory}' directory")
 
 def preview_data(file_path, num_rows=5):
     """
-    Preview the first few rows of your data to verify structure
+    Preview the first few rows of your data to verify structure.
+    Only the first num_rows rows are read.
     """
+    import pandas as pd
+    
     try:
         if file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
+            df = pd.read_excel(file_path, nrows=num_rows)
         else:
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, nrows=num_rows)
         
         print("=== DATA PREVIEW ===")
         print(f"Columns: {list(df.columns)}")
-        print(f"Shape: {df.shape}")
+        print(f"Shape of preview: {df.shape}")
         print("\nFirst few rows:")
         print(df.head(num_rows))
         
@@ -103,9 +280,20 @@ def preview_data(file_path, num_rows=5):
         print(f"Error previewing file: {e}")
         return None
 
-def validate_json_files(directory="translations"):
+def validate_json_files(directory="translations", base_file=None, workers=1, report_path=None):
     """
     Validate that all generated JSON files are properly formatted
+
+    Args:
+        directory (str): Directory containing the generated JSON files
+        base_file (str, optional): Base catalog (e.g. 'en-GB.json'); when given, every
+                                   locale is also checked against it for missing keys,
+                                   placeholder and markup mismatches (see catalog_validator)
+        workers (int): Number of locales checked in parallel against the base
+        report_path (str, optional): Write the machine-readable report here
+
+    Returns:
+        dict or None: The catalog_validator report when base_file is given
     """
     print("\n=== VALIDATING JSON FILES ===")
     
@@ -113,6 +301,11 @@ def validate_json_files(directory="translations"):
         print(f"Directory {directory} doesn't exist")
         return
     
+    if base_file:
+        report = validate_catalogs(directory, base_file, workers, report_path=report_path)
+        print_report(report)
+        return report
+    
     json_files = [f for f in os.listdir(directory) if f.endswith('.json')]
     
     for filename in json_files:
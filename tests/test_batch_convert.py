@@ -0,0 +1,33 @@
+import json
+import pandas as pd
+from batch_convert import _read_source, convert_batch
+
+def _write_workbook(path, sheets):
+    with pd.ExcelWriter(path) as writer:
+        for name, rows in sheets.items():
+            pd.DataFrame(rows, columns=["key", "de"]).to_excel(writer, sheet_name=name, index=False)
+
+def test_only_requested_tabs_are_parsed(tmp_path, monkeypatch):
+    path = tmp_path / "D4.xlsx"
+    _write_workbook(path, {"base": [["a", "Alt"]], "notes": [["x", "y"]], "fixes": [["a", "Neu"]]})
+    requested = []
+    read_excel = pd.read_excel
+
+    def recording_read_excel(io, sheet_name=0, **kwargs):
+        requested.append(sheet_name)
+        return read_excel(io, sheet_name=sheet_name, **kwargs)
+
+    monkeypatch.setattr(pd, "read_excel", recording_read_excel)
+    _, layers, error, _ = _read_source((str(path), ["fixes", "base", "missing"]))
+
+    assert error is None
+    assert requested == [["base", "fixes"]]  # Workbook order, unknown names dropped
+    assert [label for label, _ in layers] == [f"{path} [base]", f"{path} [fixes]"]
+
+def test_later_requested_tab_wins(tmp_path):
+    path = tmp_path / "D4.xlsx"
+    _write_workbook(path, {"base": [["a", "Alt"], ["b", "Bee"]], "notes": [["a", "ignored"]],
+                           "fixes": [["a", "Neu"]]})
+    out = tmp_path / "out"
+    convert_batch([str(path)], str(out), sheet_names=["base", "fixes"])
+    assert json.loads((out / "de.json").read_text(encoding="utf-8")) == {"a": "Neu", "b": "Bee"}
@@ -0,0 +1,51 @@
+import json
+import pickle
+import threading
+import pytest
+from catalog import Catalog, KeySpace, MISSING
+from catalog_utils import diff_catalogs
+
+DATA = {"b": "B", "a": {"y": {"deep": 1}, "x": [1, 2], "empty": {}}, "c": None}
+
+def test_round_trip_keeps_order_and_empty_sections():
+    assert json.dumps(Catalog.from_nested(DATA).to_nested()) == json.dumps(DATA)
+
+def test_lookup_and_replace():
+    catalog = Catalog.from_nested(DATA)
+    assert catalog["a.y.deep"] == 1
+    assert catalog.get(("a", "x")) == [1, 2]
+    assert "a.y" not in catalog
+    catalog["a.y.deep"] = 2
+    assert catalog.to_nested()["a"]["y"]["deep"] == 2
+    with pytest.raises(KeyError):
+        catalog["a.z"] = 3
+
+def test_shared_key_space_and_copy():
+    keys = KeySpace()
+    base = Catalog.from_nested(DATA, keys)
+    other = Catalog.from_nested({"c": "C", "b": "B2", "new": "N"}, keys)
+    assert len(keys) == 6
+    assert [".".join(path) for path in other] == ["c", "b", "new"]
+    copy = base.copy()
+    copy["b"] = "changed"
+    assert base["b"] == "B"
+
+def test_pickle_keeps_missing_identity():
+    catalog = pickle.loads(pickle.dumps(Catalog.from_nested({"a": "A", "b": {"c": "C"}})))
+    assert catalog.get("b.c") == "C"
+    assert catalog.get("zz", MISSING) is MISSING
+
+def test_concurrent_flattening_gives_unique_slots():
+    keys = KeySpace()
+    catalogs = [{f"s{i % 7}": {f"k{j}": j for j in range(i, i + 300)}} for i in range(16)]
+    threads = [threading.Thread(target=Catalog.from_nested, args=(data, keys)) for data in catalogs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(keys.paths)) == len(keys.paths)
+    assert all(keys.index[path] == slot for slot, path in enumerate(keys.paths))
+
+def test_diff_catalogs():
+    diff = diff_catalogs({"a": {"b": "1", "c": "2"}}, {"a": {"b": "1", "c": "3"}, "d": "4"})
+    assert diff == {"added": {"d": "4"}, "removed": {}, "changed": {"a.c": {"old": "2", "new": "3"}}}
@@ -0,0 +1,26 @@
+import json
+from catalog_binary import BinaryCatalog, compile_catalog
+
+def _compile(tmp_path, data):
+    path = tmp_path / "de.lcat"
+    compile_catalog(data, path)
+    return BinaryCatalog(path)
+
+def test_flat_dotted_keys(tmp_path):
+    with _compile(tmp_path, {"common.save": "Speichern", "common.cancel": "Abbrechen"}) as catalog:
+        assert "common.save" in catalog
+        assert catalog.get("common.save") == "Speichern"
+        assert catalog["common.cancel"] == "Abbrechen"
+        assert catalog.get(("common.save",)) == "Speichern"
+        assert catalog.get("common.missing") is None
+
+def test_nested_dotted_paths(tmp_path):
+    with _compile(tmp_path, {"common": {"save": "Speichern"}, "rooms": {"one": "1 Zimmer", "other": "Zimmer"}}) as catalog:
+        assert catalog.get("common.save") == "Speichern"
+        assert catalog[("rooms", "other")] == "Zimmer"
+        assert "common" not in catalog
+
+def test_round_trip_keeps_order(tmp_path):
+    data = {"b": "B", "a": {"y": 1, "x": [1, 2]}, "c.d": "flat"}
+    with _compile(tmp_path, data) as catalog:
+        assert json.dumps(catalog.to_dict()) == json.dumps(data)
@@ -0,0 +1,57 @@
+import json
+import pytest
+from catalog_validator import validate_catalogs
+
+BASE = {
+    "rooms": {"one": "One room", "other": "{count} rooms"},
+    "greeting": "Hello <b>{name}</b>",
+    "items": {"one": "{count} item", "other": "{count} items"},
+}
+
+def _validate(tmp_path, locale, lang="de", workers=1):
+    (tmp_path / "en-GB.json").write_text(json.dumps(BASE), encoding="utf-8")
+    (tmp_path / f"{lang}.json").write_text(json.dumps(locale), encoding="utf-8")
+    report = validate_catalogs(tmp_path, "en-GB.json", workers, use_threads=True)
+    return report, report["locales"][lang]
+
+def test_spelled_out_one_form_is_valid(tmp_path):
+    locale = {
+        "rooms": {"one": "Ein Zimmer", "other": "{count} Zimmer"},
+        "greeting": "Hallo <b>{name}</b>",
+        "items": {"one": "{count} Ding", "other": "{count} Dinge"},
+    }
+    report, result = _validate(tmp_path, locale)
+    assert result["placeholder_mismatches"] == []
+    assert result["plural_omissions"] == []
+    assert report["summary"]["errors"] == 0
+
+def test_one_form_dropping_count_is_a_warning(tmp_path):
+    locale = dict(BASE, items={"one": "Ein Ding", "other": "{count} Dinge"}, greeting="Hallo <b>{name}</b>")
+    report, result = _validate(tmp_path, locale)
+    assert [item["key"] for item in result["plural_omissions"]] == ["items"]
+    assert result["placeholder_mismatches"] == []
+    assert report["summary"] == {"locales": 1, "errors": 0, "warnings": 1}
+
+@pytest.mark.parametrize("rooms", [
+    {"one": "Ein Zimmer", "other": "Zimmer"},
+    {"one": "{n} Zimmer", "other": "{count} Zimmer"},
+])
+def test_wrong_placeholders_are_errors(tmp_path, rooms):
+    locale = dict(BASE, rooms=rooms, greeting="Hallo <b>{name}</b>")
+    report, result = _validate(tmp_path, locale)
+    assert [item["key"] for item in result["placeholder_mismatches"]] == ["rooms"]
+    assert report["summary"]["errors"] == 1
+
+def test_extra_categories_use_the_other_form(tmp_path):
+    locale = dict(BASE, rooms={"one": "Jeden pokój", "few": "{count} pokoje", "many": "{count} pokoi", "other": "{count} pokoju"})
+    locale["greeting"] = "Cześć <b>{name}</b>"
+    locale["items"] = {"one": "{count} rzecz", "few": "rzeczy", "other": "{count} rzeczy"}
+    _, result = _validate(tmp_path, locale, "pl")
+    assert [item["key"] for item in result["placeholder_mismatches"]] == ["items"]
+
+def test_missing_keys_tags_and_processes(tmp_path):
+    locale = {"greeting": "Hallo {name}", "extra": "x"}
+    report, result = _validate(tmp_path, locale, workers=2)
+    assert sorted(result["missing"]) == ["items", "rooms"]
+    assert result["extra"] == ["extra"]
+    assert [item["key"] for item in result["tag_mismatches"]] == ["greeting"]
@@ -0,0 +1,44 @@
+import json
+import os
+import stat
+import pytest
+from catalog_writer import NEW_FILE_MODE, IncrementalJsonWriter, write_catalog, write_json_atomic
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+def test_new_file_gets_default_mode(tmp_path):
+    path = tmp_path / "de.json"
+    write_json_atomic(path, {"a": "Ä"})
+    assert _mode(path) == NEW_FILE_MODE
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "Ä"}
+    assert [p.name for p in tmp_path.iterdir()] == ["de.json"]
+
+def test_replaced_file_keeps_its_mode(tmp_path):
+    path = tmp_path / "de.json"
+    write_catalog(path, {"a": "old"})
+    os.chmod(path, 0o600)
+    write_json_atomic(path, {"a": "new"})
+    assert _mode(path) == 0o600
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "new"}
+
+def test_atomic_writer_replaces_file_on_close(tmp_path):
+    path = tmp_path / "de.json"
+    write_catalog(path, {"a": "old"})
+    writer = IncrementalJsonWriter(str(path), atomic=True)
+    writer.write("a", "new")
+    writer.write("a", "newer")
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "old"}
+    writer.close()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "newer"}
+    assert [p.name for p in tmp_path.iterdir()] == ["de.json"]
+
+def test_atomic_writer_discard_keeps_old_file(tmp_path):
+    path = tmp_path / "de.json"
+    write_catalog(path, {"a": "old"})
+    with pytest.raises(RuntimeError):
+        with IncrementalJsonWriter(str(path), atomic=True) as writer:
+            writer.write("a", "new")
+            raise RuntimeError("parse error")
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "old"}
+    assert [p.name for p in tmp_path.iterdir()] == ["de.json"]
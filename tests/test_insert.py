@@ -0,0 +1,31 @@
+import json
+from insert import convert_pluralization, process_json_files_in_directory, rewrite_plurals, plural_categories
+
+def test_default_only_converts_room():
+    data = {"room": ["1 room", "rooms"], "title": ["old", "new"], "nested": {"room": ["a", "b"]}}
+    convert_pluralization(data)
+    assert data == {
+        "room": {"one": "1 room", "other": "rooms"},
+        "title": ["old", "new"],
+        "nested": {"room": ["a", "b"]},
+    }
+
+def test_merge_append_conflicts_are_left_alone(tmp_path):
+    catalog = {"room": ["Zimmer", "Zimmer"], "save": ["Sichern", "Speichern"]}
+    (tmp_path / "de.json").write_text(json.dumps(catalog), encoding="utf-8")
+    process_json_files_in_directory(str(tmp_path))
+    result = json.loads((tmp_path / "de.json").read_text(encoding="utf-8"))
+    assert result["save"] == ["Sichern", "Speichern"]
+    assert result["room"] == {"one": "Zimmer", "other": "Zimmer"}
+
+def test_patterns_opt_into_other_keys_and_locale_categories():
+    data = {"items": {"count": ["1 Ding", "wenige", "viele", "Dinge"]}, "room": ["a", "b"]}
+    rewritten = rewrite_plurals(data, plural_categories("pl"), ["items.*"])
+    assert rewritten == 1
+    assert data["items"]["count"] == {"one": "1 Ding", "few": "wenige", "many": "viele", "other": "Dinge"}
+    assert data["room"] == ["a", "b"]
+
+def test_pair_fills_every_category():
+    data = {"room": ["1 pokój", "pokoje"]}
+    convert_pluralization(data, "pl")
+    assert data["room"] == {"one": "1 pokój", "few": "pokoje", "many": "pokoje", "other": "pokoje"}
@@ -0,0 +1,34 @@
+import datetime
+import json
+from openpyxl import Workbook
+from localization import excel_to_json_files
+
+def _write_workbook(path, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+def test_streaming_writes_every_file(tmp_path):
+    source = tmp_path / "sheet.xlsx"
+    _write_workbook(source, [["key", "de.json", "fr.json"], ["a", "Hallo", "Bonjour"], ["b", "Welt", "Monde"]])
+    out = tmp_path / "out"
+    excel_to_json_files(str(source), str(out), streaming=True)
+    assert json.loads((out / "de.json").read_text(encoding="utf-8")) == {"a": "Hallo", "b": "Welt"}
+    assert json.loads((out / "fr.json").read_text(encoding="utf-8")) == {"a": "Bonjour", "b": "Monde"}
+
+def test_streaming_error_keeps_existing_files(tmp_path, capsys):
+    source = tmp_path / "sheet.xlsx"
+    rows = [["key", "de.json", "fr.json"]] + [[f"k{i}", f"Hallo {i}", f"Salut {i}"] for i in range(4)]
+    rows.append(["k4", datetime.datetime(2024, 1, 1), "Salut"])  # Not JSON serializable
+    _write_workbook(source, rows)
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "de.json").write_text('{"old": "Alt"}', encoding="utf-8")
+
+    excel_to_json_files(str(source), str(out), streaming=True)
+
+    assert "Error occurred" in capsys.readouterr().out
+    assert sorted(p.name for p in out.iterdir()) == ["de.json"]
+    assert json.loads((out / "de.json").read_text(encoding="utf-8")) == {"old": "Alt"}
@@ -0,0 +1,171 @@
+import pytest
+import localization_openai as translator
+from translation_backends import EchoBackend, TranslationError
+
+class FlakyBackend(EchoBackend):
+    """Echo backend that fails for every string containing "FAIL" """
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        if "FAIL" in text:
+            raise TranslationError("boom")
+        return super().translate(text, target_lang, session, limiter)
+
+    def translate_batch(self, texts, target_lang, session=None, limiter=None):
+        if any("FAIL" in text for text in texts):
+            raise TranslationError("boom")
+        return super().translate_batch(texts, target_lang, session, limiter)
+
+@pytest.fixture
+def flaky(monkeypatch):
+    monkeypatch.setattr(translator, "backend", FlakyBackend())
+    monkeypatch.setattr(translator, "translation_memory", None)
+    monkeypatch.setattr(translator, "translation_journals", {})
+    monkeypatch.setattr(translator, "translation_failures", {})
+
+BASE = {"a": "Hello", "b": {"c": "FAIL new", "d": "FAIL changed"}, "e": "World"}
+EXISTING = {"a": "Hallo", "b": {"d": "Alt"}}
+MANIFEST = {"a": translator.source_hash("Hello"), "b": {"d": "outdated"}}
+
+@pytest.mark.parametrize("translate", [translator.translate_dict, translator.translate_dict_batched])
+def test_failed_strings_never_write_the_source_text(flaky, translate):
+    result = translate(BASE, "de", EXISTING, MANIFEST)
+    # New key left out, outdated key keeps its previous translation
+    assert result == {"a": "Hallo", "b": {"d": "Alt"}, "e": "[de] World"}
+    assert set(translator.translation_failures["de"]) == {"FAIL new", "FAIL changed"}
+
+def test_failed_keys_stay_out_of_the_manifest(flaky):
+    hashes = translator.hash_catalog(BASE)
+    kept = translator.manifest_hashes(BASE, hashes, {"FAIL changed": "boom"})
+    assert kept == {"a": hashes["a"], "b": {"c": hashes["b"]["c"]}, "e": hashes["e"]}
+
+def test_untranslatable_strings_keep_their_text(flaky):
+    assert translator.translate_dict({"blank": " ", "only": "{count}"}, "de", {}) == {"blank": " ", "only": "{count}"}
+
+class PaddingBackend(EchoBackend):
+    """Adds the stray whitespace real responses come back with"""
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        return f"  {super().translate(text.strip(), target_lang)}\n"
+
+    def translate_batch(self, texts, target_lang, session=None, limiter=None):
+        return [f" {translation} " for translation in super().translate_batch([text.strip() for text in texts], target_lang)]
+
+def test_single_and_batch_whitespace_match(monkeypatch):
+    monkeypatch.setattr(translator, "backend", PaddingBackend())
+    monkeypatch.setattr(translator, "translation_memory", None)
+    monkeypatch.setattr(translator, "translation_journals", {})
+    base = {"a": "Hello", "b": "Name: ", "c": " indented {x}"}
+    expected = {"a": "[de] Hello", "b": "[de] Name: ", "c": " [de] indented {x}"}
+    assert translator.translate_dict(base, "de", {}) == expected
+    assert translator.translate_dict_batched(base, "de", {}) == expected
+
+PLURAL = {"one": "1 Zimmer", "other": "Zimmer"}
+
+@pytest.mark.parametrize("translate", [translator.translate_dict, translator.translate_dict_batched])
+@pytest.mark.parametrize("base_value", [["1 room", "rooms"], "Room"])
+def test_existing_plural_forms_survive_other_base_shapes(flaky, translate, base_value):
+    base = {"room": base_value, "x": "Hi"}
+    manifest = {"room": "outdated", "x": "outdated"}
+    assert translate(base, "de", {"room": PLURAL}, manifest) == {"room": PLURAL, "x": "[de] Hi"}
+
+@pytest.mark.parametrize("translate", [translator.translate_dict, translator.translate_dict_batched])
+def test_plural_base_forms_are_translated_one_by_one(flaky, translate):
+    base = {"room": {"one": "1 room", "other": "rooms", "many": "FAIL"}}
+    existing = {"room": {"one": "1 Zimmer", "other": "Zimmer", "few": "kept"}}
+    manifest = {"room": {"one": translator.source_hash("1 room"), "other": "outdated"}}
+    result = translate(base, "de", existing, manifest)
+    # Current form kept, outdated one retranslated, failed one left out, locale-only form kept
+    assert result == {"room": {"one": "1 Zimmer", "other": "[de] rooms", "few": "kept"}}
+
+class BrokenBackend(EchoBackend):
+    """Fails the way an unparseable response used to: with something other than TranslationError"""
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        if "FAIL" in text:
+            raise TypeError("'NoneType' object is not subscriptable")
+        return super().translate(text, target_lang, session, limiter)
+
+    def translate_batch(self, texts, target_lang, session=None, limiter=None):
+        if any("FAIL" in text for text in texts):
+            raise TypeError("'NoneType' object is not subscriptable")
+        return super().translate_batch(texts, target_lang, session, limiter)
+
+@pytest.mark.parametrize("translate", [translator.translate_dict, translator.translate_dict_batched])
+def test_unexpected_errors_fail_the_string_not_the_run(flaky, monkeypatch, translate):
+    monkeypatch.setattr(translator, "backend", BrokenBackend())
+    result = translate({"a": "Hello", "b": "FAIL", "c": "World"}, "de", {})
+    assert result == {"a": "[de] Hello", "c": "[de] World"}
+    assert set(translator.translation_failures["de"]) == {"FAIL"}
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self.body
+
+class FakeSession:
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, params=None, timeout=None):
+        return FakeResponse(self.body)
+
+    post = get
+
+class NoLimit:
+    def acquire(self): pass
+    def record_success(self): pass
+    def record_failure(self): pass
+    def backoff(self, attempt, retry_after=None): pass
+
+@pytest.mark.parametrize("body", [None, [], [[None]], {"error": "x"}, ValueError("Expecting value")])
+def test_unparseable_response_raises_translation_error(body):
+    with pytest.raises(TranslationError):
+        translator._send_request({"q": "Hello"}, FakeSession(body), NoLimit())
+
+def test_parseable_response_is_joined():
+    body = [[["Hallo ", "Hello "], ["Welt", "World"]]]
+    assert translator._send_request({"q": "Hello World"}, FakeSession(body), NoLimit()) == "Hallo Welt"
+
+@pytest.fixture
+def offline_run(tmp_path, monkeypatch):
+    """main() configured against a production folder and an offline folder under tmp_path"""
+    base = tmp_path / "en-GB.json"
+    base.write_text('{"a": "Hello"}', encoding="utf-8")
+    production = tmp_path / "assets"
+    production.mkdir()
+    (production / "de.json").write_text('{"a": "Hallo"}', encoding="utf-8")
+    monkeypatch.setattr(translator, "BASE_LANG_FILE", str(base))
+    monkeypatch.setattr(translator, "TARGET_LANGS", ["de"])
+    monkeypatch.setattr(translator, "OUTPUT_DIR", str(production))
+    monkeypatch.setattr(translator, "TRANSLATION_MEMORY_FILE", str(production / ".translation_memory.sqlite"))
+    monkeypatch.setattr(translator, "MANIFEST_DIR", str(production / ".manifest"))
+    monkeypatch.setattr(translator, "JOURNAL_DIR", str(production / ".journal"))
+    monkeypatch.setattr(translator, "OFFLINE_OUTPUT_DIR", str(tmp_path / "offline"))
+    monkeypatch.setattr(translator, "BACKEND", "echo")
+    monkeypatch.setattr(translator, "translation_journals", {})
+    monkeypatch.setattr(translator, "translation_failures", {})
+    return tmp_path
+
+def test_offline_backend_never_touches_production(offline_run):
+    production = offline_run / "assets"
+    before = sorted(p.name for p in production.iterdir())
+    translator.main()
+    assert sorted(p.name for p in production.iterdir()) == before
+    assert (production / "de.json").read_text(encoding="utf-8") == '{"a": "Hallo"}'
+    offline = offline_run / "offline"
+    assert (offline / "de.json").read_text(encoding="utf-8") == '{\n  "a": "[de] Hello"\n}'
+    assert (offline / ".translation_memory.sqlite").exists()
+    assert (offline / ".manifest" / "de.json").exists()
+
+def test_offline_backend_writes_where_asked(offline_run):
+    chosen = offline_run / "chosen"
+    translator.main(str(chosen))
+    assert (chosen / "de.json").exists()
+    assert not (offline_run / "offline").exists()
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import pytest
+from merge_engine import STRATEGIES, merge_append, merge_deep_overwrite, merge_layers, merge_overwrite
+
+def _write_folder(folder, catalogs):
+    folder.mkdir(parents=True, exist_ok=True)
+    for name, data in catalogs.items():
+        (folder / name).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return folder
+
+def _read_folder(folder):
+    return {p.name: json.loads(p.read_text(encoding="utf-8")) for p in sorted(folder.glob("*.json"))}
+
+BASE = {"de.json": {"a": "Alt", "s": {"x": "X", "y": "Y"}, "l": ["1"]}, "fr.json": {"a": "Vieux"}}
+OVERLAY1 = {"de.json": {"a": "Neu", "s": {"x": "X2"}, "l": ["2"]}}
+OVERLAY2 = {"de.json": {"b": "Bee", "s": {"z": "Z"}}, "fr.json": {"a": "Nouveau"}}
+
+def test_append_keeps_both_values():
+    assert merge_append({"a": "old", "s": {"x": 1}, "l": [1]}, {"a": "new", "s": {"y": 2}, "l": [2]}) == {
+        "a": ["old", "new"], "s": {"x": 1, "y": 2}, "l": [1, 2]}
+
+def test_overwrite_replaces_top_level_keys():
+    assert merge_overwrite({"a": "old", "s": {"x": 1, "y": 2}}, {"a": "new", "s": {"x": 3}}) == {
+        "a": "new", "s": {"x": 3}}
+
+def test_deep_overwrite_keeps_unmentioned_nested_keys():
+    assert merge_deep_overwrite({"a": "old", "s": {"x": 1, "y": 2}}, {"a": "new", "s": {"x": 3}}) == {
+        "a": "new", "s": {"x": 3, "y": 2}}
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_two_overlays_in_one_call_equal_two_chained_runs(tmp_path, strategy):
+    base = _write_folder(tmp_path / "base", BASE)
+    overlay1 = _write_folder(tmp_path / "o1", OVERLAY1)
+    overlay2 = _write_folder(tmp_path / "o2", OVERLAY2)
+
+    merge_layers(base, [overlay1, overlay2], strategy, output_folder=tmp_path / "once")
+
+    chained = tmp_path / "chained"
+    shutil.copytree(base, chained)
+    merge_layers(chained, [overlay1], strategy)
+    merge_layers(chained, [overlay2], strategy)
+
+    assert _read_folder(tmp_path / "once") == _read_folder(chained)
+    assert _read_folder(base) == BASE  # Written to the output folder only
+
+def test_later_overlays_win(tmp_path):
+    base = _write_folder(tmp_path / "base", {"de.json": {"a": "Alt"}})
+    overlay1 = _write_folder(tmp_path / "o1", {"de.json": {"a": "Eins"}})
+    overlay2 = _write_folder(tmp_path / "o2", {"de.json": {"a": "Zwei"}})
+    merge_layers(base, [overlay1, overlay2], "overwrite")
+    assert _read_folder(base) == {"de.json": {"a": "Zwei"}}
+
+def test_unchanged_output_is_not_rewritten(tmp_path):
+    base = _write_folder(tmp_path / "base", BASE)
+    overlay = _write_folder(tmp_path / "o1", OVERLAY1)
+    output = tmp_path / "out"
+    merge_layers(base, [overlay], "overwrite", output_folder=output)
+    os.utime(output / "de.json", ns=(0, 0))
+
+    results = merge_layers(base, [overlay], "overwrite", output_folder=output)
+
+    assert [status for _, status, _, _ in results] == ["unchanged"]
+    assert os.stat(output / "de.json").st_mtime_ns == 0
+
+def test_overlay_adding_nothing_leaves_base_untouched(tmp_path):
+    base = _write_folder(tmp_path / "base", {"de.json": {"a": "Alt"}})
+    overlay = _write_folder(tmp_path / "o1", {"de.json": {"a": "Alt"}})
+    os.utime(base / "de.json", ns=(0, 0))
+    results = merge_layers(base, [overlay], "overwrite")
+    assert [status for _, status, _, _ in results] == ["unchanged"]
+    assert os.stat(base / "de.json").st_mtime_ns == 0
+
+def test_dry_run_writes_nothing(tmp_path):
+    base = _write_folder(tmp_path / "base", BASE)
+    overlay = _write_folder(tmp_path / "o1", OVERLAY1)
+    before = {p.name: p.read_bytes() for p in base.iterdir()}
+
+    in_place = merge_layers(base, [overlay], "overwrite", dry_run=True)
+    to_output = merge_layers(base, [overlay], "overwrite", output_folder=tmp_path / "out", dry_run=True)
+
+    assert [status for _, status, _, _ in in_place] == ["would-merge"]
+    assert [status for _, status, _, _ in to_output] == ["would-merge"]
+    assert {p.name: p.read_bytes() for p in base.iterdir()} == before
+    assert not (tmp_path / "out").exists()
+
+def test_unknown_strategy_merges_nothing(tmp_path):
+    base = _write_folder(tmp_path / "base", BASE)
+    overlay = _write_folder(tmp_path / "o1", OVERLAY1)
+    assert merge_layers(base, [overlay], "shuffle") == []
+    assert _read_folder(base) == BASE
@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import localization_openai as translator
+from placeholder_mask import RestoreError, mask_text, restore_text
+from translation_backends import EchoBackend
+
+BASE = {
+    "greeting": "Hello {name}, you have %s <b>new</b> messages &amp; more",
+    "only": "{count}",
+    "markup": "<br/>",
+    "nested": {"plain": "Save", "positional": "%1$d of %2$d"},
+}
+EXPECTED = {
+    "greeting": "[de] Hello {name}, you have %s <b>new</b> messages &amp; more",
+    "only": "{count}",
+    "markup": "<br/>",
+    "nested": {"plain": "[de] Save", "positional": "[de] %1$d of %2$d"},
+}
+
+@pytest.fixture
+def echo(monkeypatch):
+    monkeypatch.setattr(translator, "backend", EchoBackend())
+    monkeypatch.setattr(translator, "translation_memory", None)
+    monkeypatch.setattr(translator, "translation_journals", {})
+    monkeypatch.setattr(translator, "MASK_PLACEHOLDERS", True)
+
+def test_round_trip():
+    text = "Hi {{user}}, <a href='x'>%s</a> ⟦0⟧"
+    masked, spans = mask_text(text)
+    assert "{" not in masked and "<" not in masked and "%" not in masked
+    assert restore_text(masked, spans) == text
+
+@pytest.mark.parametrize("translated", ["⟦0⟧ ⟦0⟧ ⟦1⟧", "⟦0⟧", "⟦0⟧ ⟦1⟧ ⟦2⟧", "⟦0⟧ ⟦1⟧ ⟦"])
+def test_mangled_markers_are_rejected(translated):
+    with pytest.raises(RestoreError):
+        restore_text(translated, ("{x}", "<b>"))
+
+def test_single_mode(echo):
+    assert translator.translate_dict(BASE, "de", {}) == EXPECTED
+
+def test_batch_mode(echo):
+    assert translator.translate_dict_batched(BASE, "de", {}) == EXPECTED
+
+@pytest.mark.parametrize("batch_mode", [False, True])
+def test_async_mode(echo, monkeypatch, batch_mode):
+    monkeypatch.setattr(translator, "BATCH_MODE", batch_mode)
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return await translator.translate_dict_async(
+                BASE, "de", {}, None, None, asyncio.Semaphore(2), executor
+            )
+
+    assert asyncio.run(run()) == EXPECTED
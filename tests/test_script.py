@@ -0,0 +1,28 @@
+import json
+from script import convert_sheet_to_json_files
+
+def _write_csv(path, rows):
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+def test_chunked_csv_writes_every_language(tmp_path):
+    source = tmp_path / "sheet.csv"
+    _write_csv(source, ["key,en,de"] + [f"k{i},Hello {i},Hallo {i}" for i in range(5)])
+    out = tmp_path / "out"
+    convert_sheet_to_json_files(str(source), str(out), chunksize=2)
+    assert json.loads((out / "de.json").read_text(encoding="utf-8")) == {f"k{i}": f"Hallo {i}" for i in range(5)}
+    assert sorted(p.name for p in out.iterdir()) == ["de.json", "en.json"]
+
+def test_chunked_csv_error_in_later_chunk_writes_nothing(tmp_path, capsys):
+    source = tmp_path / "sheet.csv"
+    # The malformed row lands in the third chunk, after two have been written
+    _write_csv(source, ["key,en,de", "k0,Hello,Hallo", "k1,Bye,Tschüss", "k2,Yes,Ja", "k3,No,Nein",
+                        "k4,\"unclosed,quote", "k5,Maybe,Vielleicht"])
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "de.json").write_text('{"old": "Alt"}', encoding="utf-8")
+
+    convert_sheet_to_json_files(str(source), str(out), chunksize=2)
+
+    assert "✗ Error reading" in capsys.readouterr().out
+    assert sorted(p.name for p in out.iterdir()) == ["de.json"]
+    assert json.loads((out / "de.json").read_text(encoding="utf-8")) == {"old": "Alt"}
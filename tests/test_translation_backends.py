@@ -0,0 +1,34 @@
+import pytest
+from translation_backends import EchoBackend, RecordingBackend, ReplayBackend, TranslationError
+
+def test_echo_is_deterministic():
+    backend = EchoBackend()
+    assert backend.translate("Hello", "de") == "[de] Hello"
+    assert backend.translate_batch(["a", "b"], "fr") == ["[fr] a", "[fr] b"]
+
+def test_replay_answers_from_recording(tmp_path):
+    path = str(tmp_path / "rec.jsonl")
+    recorder = RecordingBackend(EchoBackend(), path)
+    recorder.translate_batch(["a", "b"], "de")
+    recorder.close()
+
+    replay = ReplayBackend(path)
+    assert replay.translate("b", "de") == "[de] b"
+    with pytest.raises(TranslationError):
+        replay.translate("c", "de")
+
+def test_recording_resumed_after_crash_is_replayable(tmp_path):
+    path = str(tmp_path / "rec.jsonl")
+    recorder = RecordingBackend(EchoBackend(), path)
+    recorder.translate("a", "de")
+    recorder.close()
+    with open(path, "ab") as f:
+        f.write(b'{"lang": "de", "source": "b", "tra')
+
+    recorder = RecordingBackend(EchoBackend(), path)
+    recorder.translate("c", "de")
+    recorder.translate("d", "de")
+    recorder.close()
+
+    replay = ReplayBackend(path)
+    assert replay.responses == {("de", "a"): "[de] a", ("de", "c"): "[de] c", ("de", "d"): "[de] d"}
@@ -0,0 +1,44 @@
+from translation_journal import TranslationJournal
+
+def _crash_mid_write(path, fragment=b'{"source": "b", "transl'):
+    with open(path, "ab") as f:
+        f.write(fragment)
+
+def test_resume_after_torn_line_keeps_later_entries(tmp_path):
+    journal = TranslationJournal(tmp_path, "de")
+    journal.record("a", "A")
+    journal.close()
+    _crash_mid_write(journal.path)
+
+    resumed = TranslationJournal(tmp_path, "de")
+    assert resumed.done == {"a": "A"}
+    resumed.record("c", "C")
+    resumed.record("d", "D")
+    resumed.close()
+
+    assert TranslationJournal(tmp_path, "de").done == {"a": "A", "c": "C", "d": "D"}
+
+def test_line_torn_inside_a_multibyte_character(tmp_path):
+    journal = TranslationJournal(tmp_path, "ja")
+    journal.record("a", "あ")
+    journal.close()
+    _crash_mid_write(journal.path, '{"source": "b", "translation": "い'.encode("utf-8")[:-1])
+
+    resumed = TranslationJournal(tmp_path, "ja")
+    resumed.record("c", "う")
+    resumed.close()
+
+    assert TranslationJournal(tmp_path, "ja").done == {"a": "あ", "c": "う"}
+
+def test_complete_removes_journal(tmp_path):
+    journal = TranslationJournal(tmp_path, "fr")
+    journal.record("a", "A")
+    journal.complete()
+    assert TranslationJournal(tmp_path, "fr").done == {}
+
+def test_failures_are_not_treated_as_done(tmp_path):
+    journal = TranslationJournal(tmp_path, "fr")
+    journal.record_failure("a", "boom")
+    journal.close()
+    resumed = TranslationJournal(tmp_path, "fr")
+    assert resumed.get("a") is None
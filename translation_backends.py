@@ -0,0 +1,158 @@
+"""
+Translation backends.
+
+A backend turns source strings into translations; everything around it
+(translation memory, journal, placeholder masking, batching) stays in
+localization_openai. Backends implement translate() or translate_async(),
+and may override the batch variants when the provider has a cheaper
+multi-string call.
+
+Backends that need no network:
+- EchoBackend answers every string deterministically ("[de] Hello"),
+  optionally with a simulated latency, for load tests and offline runs.
+- ReplayBackend answers from responses recorded by RecordingBackend.
+"""
+import asyncio
+import json
+import threading
+import time
+from jsonl import read_jsonl, open_jsonl
+
+class TranslationError(Exception):
+    """Raised when a string could not be translated, even after retrying"""
+
+class TranslationBackend:
+    """
+    Base class of translation backends.
+
+    Subclasses override translate() (blocking) or translate_async() (native
+    asyncio); each falls back on the other. session and limiter are the
+    pooled HTTP session and rate limiter of the run, for backends that use them.
+    """
+
+    name = "backend"
+
+    def create_session(self, pool_size):
+        """Pooled session shared by the calls of one run, or None if the backend needs none"""
+        return None
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        """Translate one string, raising TranslationError on failure"""
+        if type(self).translate_async is TranslationBackend.translate_async:
+            raise NotImplementedError(f"{type(self).__name__} implements neither translate nor translate_async")
+        return asyncio.run(self.translate_async(text, target_lang, session, limiter))
+
+    def translate_batch(self, texts, target_lang, session=None, limiter=None):
+        """Translate several strings, returning one translation per string"""
+        return [self.translate(text, target_lang, session, limiter) for text in texts]
+
+    async def translate_async(self, text, target_lang, session=None, limiter=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate, text, target_lang, session, limiter)
+
+    async def translate_batch_async(self, texts, target_lang, session=None, limiter=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate_batch, texts, target_lang, session, limiter)
+
+    def close(self):
+        """Release whatever the backend holds (files, connections)"""
+
+class EchoBackend(TranslationBackend):
+    """Deterministic local backend: formats each string with template instead of translating it"""
+
+    name = "echo"
+
+    def __init__(self, template="[{lang}] {text}", latency=0.0):
+        """
+        Args:
+            template (str): Format of the "translation", with {lang} and {text}
+            latency (float): Seconds to wait per call, to mimic a remote provider
+        """
+        self.template = template
+        self.latency = latency
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.template.format(lang=target_lang, text=text)
+
+    def translate_batch(self, texts, target_lang, session=None, limiter=None):
+        if self.latency:
+            time.sleep(self.latency)  # One round trip for the whole batch
+        return [self.template.format(lang=target_lang, text=text) for text in texts]
+
+    async def translate_async(self, text, target_lang, session=None, limiter=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.template.format(lang=target_lang, text=text)
+
+def _load_recording(path):
+    """{(lang, source): translation} from a recording; torn lines from a crashed run are skipped"""
+    return {(entry["lang"], entry["source"]): entry["translation"] for entry in read_jsonl(path)}
+
+class ReplayBackend(TranslationBackend):
+    """Answers from a recording made by RecordingBackend, without any network"""
+
+    name = "replay"
+
+    def __init__(self, path, fallback=None):
+        """
+        Args:
+            path (str): JSONL recording of {"lang", "source", "translation"} entries
+            fallback (TranslationBackend, optional): Asked for strings missing from
+                                                     the recording; otherwise they fail
+        """
+        self.path = path
+        self.responses = _load_recording(path)
+        self.fallback = fallback
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        translation = self.responses.get((target_lang, text))
+        if translation is not None:
+            return translation
+        if self.fallback is not None:
+            return self.fallback.translate(text, target_lang, session, limiter)
+        raise TranslationError(f"No recorded translation of {text!r} to '{target_lang}' in {self.path}")
+
+class RecordingBackend(TranslationBackend):
+    """Passes calls to another backend and appends every response to a recording for ReplayBackend"""
+
+    def __init__(self, backend, path):
+        """
+        Args:
+            backend (TranslationBackend): Backend doing the actual translation
+            path (str): JSONL file the responses are appended to
+        """
+        self.backend = backend
+        self.path = path
+        self.name = f"{backend.name}, recorded to {path}"
+        self._lock = threading.Lock()
+        self._file = open_jsonl(path)
+
+    def _record(self, texts, translations, target_lang):
+        lines = "".join(
+            json.dumps({"lang": target_lang, "source": text, "translation": translation}, ensure_ascii=False) + "\n"
+            for text, translation in zip(texts, translations)
+        )
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def create_session(self, pool_size):
+        return self.backend.create_session(pool_size)
+
+    def translate(self, text, target_lang, session=None, limiter=None):
+        translation = self.backend.translate(text, target_lang, session, limiter)
+        self._record([text], [translation], target_lang)
+        return translation
+
+    def translate_batch(self, texts, target_lang, session=None, limiter=None):
+        translations = self.backend.translate_batch(texts, target_lang, session, limiter)
+        self._record(texts, translations, target_lang)
+        return translations
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.backend.close()
@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+from catalog_writer import write_json_atomic
+from jsonl import read_jsonl, open_jsonl
+
+CHECKPOINT_EVERY = 20  # Journal entries buffered before they are forced to disk
+
+class TranslationJournal:
+    """
+    Append-only checkpoint of one language's translation run.
+
+    Every translated string is appended to <lang>.jsonl as soon as the
+    response arrives, so an interrupted run can resume without paying for
+    those requests again. Strings that could not be translated are kept
+    apart in <lang>.failed.json and are never treated as done. Safe to
+    share between worker threads.
+    """
+
+    def __init__(self, directory, lang):
+        """
+        Args:
+            directory (str): Journal directory (created if missing)
+            lang (str): Target language code
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.lang = lang
+        self.path = os.path.join(directory, f"{lang}.jsonl")
+        self.failed_path = os.path.join(directory, f"{lang}.failed.json")
+        self.done = self._load()
+        self.failed = {}
+        self.resumed = len(self.done)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._file = open_jsonl(self.path)
+
+    def _load(self):
+        # A torn line from a killed run is skipped; entries after it are still read
+        return {entry["source"]: entry["translation"] for entry in read_jsonl(self.path)}
+
+    def get(self, source):
+        """Return the journaled translation of source, or None"""
+        return self.done.get(source)
+
+    def record(self, source, translation):
+        """Checkpoint a successful translation"""
+        line = json.dumps({"source": source, "translation": translation}, ensure_ascii=False)
+        with self._lock:
+            self.done[source] = translation
+            self.failed.pop(source, None)
+            self._file.write(line + "\n")
+            self._unsynced += 1
+            if self._unsynced >= CHECKPOINT_EVERY:
+                self._sync()
+
+    def record_failure(self, source, error):
+        """Remember a string that could not be translated, so it is retried next run"""
+        with self._lock:
+            self.failed[source] = str(error)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        """Flush the journal and leave it in place, e.g. when a run is interrupted"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._sync()
+            self._file.close()
+            self._file = None
+            if self.failed:
+                write_json_atomic(self.failed_path, self.failed)
+
+    def complete(self):
+        """
+        Drop the journal once the language file has been saved; it holds
+        nothing the file does not. Failures of this run stay in <lang>.failed.json.
+        """
+        self.close()
+        os.remove(self.path)
+        if not self.failed and os.path.exists(self.failed_path):
+            os.remove(self.failed_path)
@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+COMMIT_EVERY = 50  # Number of new entries buffered before committing to disk
+
+class TranslationMemory:
+    """
+    On-disk translation memory keyed by (source text, target language).
+
+    Backed by SQLite so identical strings are only ever translated once,
+    within a run and across runs. Safe to share between worker threads.
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path (str): Path to the SQLite file (created if missing)
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, lang)
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._used = set()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get(self, source, lang):
+        """Return the stored translation of source into lang, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE source = ? AND lang = ?",
+                (source, lang),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._used.add((source, lang))
+            return row[0]
+
+    def put(self, source, lang, translation):
+        """Store a successful translation"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (source, lang, translation, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, lang, translation, now, now),
+            )
+            self.stores += 1
+            self._uncommitted += 1
+            if self._uncommitted >= COMMIT_EVERY:
+                self._flush()
+
+    def _flush(self):
+        # Entries read during the run are marked as used in one statement
+        if self._used:
+            self._conn.executemany(
+                "UPDATE translations SET last_used = ? WHERE source = ? AND lang = ?",
+                [(time.time(), source, lang) for source, lang in self._used],
+            )
+            self._used.clear()
+        self._conn.commit()
+        self._uncommitted = 0
+
+    def prune(self, max_age_days=None, keep_sources=None):
+        """
+        Remove stale entries.
+
+        Args:
+            max_age_days (float, optional): Remove entries not used for this many days
+            keep_sources (iterable, optional): Remove entries whose source text is not in this set
+
+        Returns:
+            int: Number of removed entries
+        """
+        removed = 0
+        with self._lock:
+            self._flush()
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                cursor = self._conn.execute("DELETE FROM translations WHERE last_used < ?", (cutoff,))
+                removed += cursor.rowcount
+            if keep_sources is not None:
+                keep_sources = set(keep_sources)
+                stale = [
+                    (source,) for (source,) in self._conn.execute("SELECT DISTINCT source FROM translations")
+                    if source not in keep_sources
+                ]
+                cursor = self._conn.executemany("DELETE FROM translations WHERE source = ?", stale)
+                removed += cursor.rowcount
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return removed
+
+    def count(self):
+        """Return the number of stored entries per language"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lang, COUNT(*) FROM translations GROUP BY lang ORDER BY lang"
+            ).fetchall()
+        return dict(rows)
+
+    def report(self):
+        """Print hit/miss statistics for this run"""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        print("\n=== TRANSLATION MEMORY ===")
+        print(f"Lookups: {lookups} ({self.hits} hits, {self.misses} misses, {hit_rate:.1f}% hit rate)")
+        print(f"New entries stored: {self.stores}")
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _collect_strings(data, strings):
+    for value in data.values():
+        if isinstance(value, dict):
+            _collect_strings(value, strings)
+        elif isinstance(value, str):
+            strings.add(value)
+    return strings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or prune the translation memory")
+    parser.add_argument("db_path", help="Path to the translation memory SQLite file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="Show the number of entries per language")
+    prune_parser = subparsers.add_parser("prune", help="Remove stale entries")
+    prune_parser.add_argument("--days", type=float, help="Remove entries not used for this many days")
+    prune_parser.add_argument("--base", help="Remove entries whose source is no longer in this base JSON file")
+    args = parser.parse_args()
+
+    with TranslationMemory(args.db_path) as memory:
+        if args.command == "stats":
+            counts = memory.count()
+            for lang, count in counts.items():
+                print(f"  {lang}: {count} entries")
+            print(f"Total: {sum(counts.values())} entries")
+        else:
+            keep_sources = None
+            if args.base:
+                with open(args.base, "r", encoding="utf-8") as f:
+                    keep_sources = _collect_strings(json.load(f), set())
+            removed = memory.prune(args.days, keep_sources)
+            print(f"Removed {removed} stale entries")
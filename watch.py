@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import time
+from script import read_sheet, build_language_dict
+from catalog_writer import write_json_atomic
+from catalog_utils import diff_catalogs, diff_counts
+from metrics import metrics, log
+
+POLL_INTERVAL = 0.2  # Seconds between checks of the source file
+DEBOUNCE_SECONDS = 0.3  # The file must be unchanged this long before it is read (exports are written in steps)
+
+def _file_signature(file_path):
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _changed_languages(old_df, new_df, languages):
+    """
+    Compare two versions of the sheet row by row.
+
+    Returns:
+        tuple: (languages whose column changed, number of changed rows); every
+               language counts as changed when the keys or the shape differ
+    """
+    import pandas as pd
+
+    key_column = new_df.columns[0]
+    if (
+        old_df is None
+        or list(old_df.columns) != list(new_df.columns)
+        or len(old_df) != len(new_df)
+        or not old_df[key_column].equals(new_df[key_column])
+    ):
+        return list(languages), len(new_df)
+
+    changed_rows = pd.Series(False, index=new_df.index)
+    changed = []
+    for lang_code in languages:
+        old_values, new_values = old_df[lang_code], new_df[lang_code]
+        differs = (old_values != new_values) & ~(old_values.isna() & new_values.isna())
+        if differs.any():
+            changed.append(lang_code)
+            changed_rows |= differs
+    return changed, int(changed_rows.sum())
+
+class SheetWatcher:
+    """
+    Keep a directory of <lang>.json files in sync with a translation sheet.
+
+    The last ingested version of the sheet is kept in memory. When the file
+    changes, only the language columns whose cells changed are rebuilt, and
+    only the locale files whose content actually differs are rewritten
+    (atomically, so readers never see a half-written file). Output matches
+    script.convert_sheet_to_json_files.
+    """
+
+    def __init__(self, file_path, output_directory="translations"):
+        """
+        Args:
+            file_path (str): Path to the Excel/CSV export of the sheet
+            output_directory (str): Directory holding the <lang>.json files
+        """
+        self.file_path = file_path
+        self.output_directory = output_directory
+        self.signature = None
+        self._sheet = None
+        self._catalogs = {}  # Language -> content of its JSON file as last written
+
+    def _load_catalog(self, lang_code):
+        """What is on disk for a language, so the first sync does not rewrite unchanged files"""
+        path = os.path.join(self.output_directory, f"{lang_code}.json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def sync(self):
+        """
+        Ingest the current version of the sheet and rewrite the locales that changed.
+
+        Returns:
+            list: Language codes whose files were rewritten
+        """
+        import pandas as pd
+
+        start = time.perf_counter()
+        with metrics.stage("read"):
+            df = read_sheet(self.file_path)
+        key_column = df.columns[0]
+        languages = [lang_code for lang_code in df.columns[1:] if not (pd.isna(lang_code) or lang_code == '')]
+
+        first_sync = self._sheet is None
+        changed_languages, changed_rows = _changed_languages(self._sheet, df, languages)
+        self._sheet = df
+
+        os.makedirs(self.output_directory, exist_ok=True)
+        written = []
+        for lang_code in changed_languages:
+            with metrics.stage("transform"):
+                json_data, _ = build_language_dict(df[key_column], df[lang_code])
+            previous = self._catalogs.get(lang_code)
+            if previous is None:
+                previous = self._load_catalog(lang_code)
+            # Key order counts too: the file is rewritten if rows were moved
+            if previous is not None and list(previous.items()) == list(json_data.items()):
+                self._catalogs[lang_code] = json_data
+                continue
+            with metrics.stage("write"):
+                write_json_atomic(os.path.join(self.output_directory, f"{lang_code}.json"), json_data)
+            self._catalogs[lang_code] = json_data
+            written.append(lang_code)
+            metrics.incr("files_written")
+            log(f"  ✓ {lang_code}.json: {diff_counts(diff_catalogs(previous, json_data))}")
+
+        elapsed = time.perf_counter() - start
+        rows = f"initial sync of {len(df)} rows" if first_sync else f"{changed_rows} changed rows"
+        print(
+            f"Synced {self.file_path}: {rows}, "
+            f"{len(written)} of {len(languages)} locales rewritten in {elapsed:.3f}s"
+        )
+        return written
+
+    def poll(self):
+        """
+        Sync if the source file changed since the last sync.
+
+        Returns:
+            bool: True if a sync ran
+        """
+        signature = _file_signature(self.file_path)
+        if signature is None or signature == self.signature:
+            return False
+        # Wait for the export to settle before reading it
+        while True:
+            time.sleep(DEBOUNCE_SECONDS)
+            settled = _file_signature(self.file_path)
+            if settled == signature:
+                break
+            signature = settled
+            if signature is None:
+                return False
+        try:
+            self.sync()
+        except Exception as e:
+            # A file caught mid-write is retried on its next change
+            print(f"✗ Error reading {self.file_path}: {e}")
+        self.signature = signature
+        return True
+
+    def run(self, poll_interval=POLL_INTERVAL):
+        """Watch the source file until interrupted"""
+        print(f"👀 Watching {self.file_path} → {self.output_directory} (Ctrl-C to stop)")
+        try:
+            while True:
+                if not self.poll():
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+
+def watch_sheet(file_path, output_directory="translations", poll_interval=POLL_INTERVAL):
+    """
+    Regenerate the locale files of a translation sheet every time it changes.
+
+    Args:
+        file_path (str): Path to the Excel/CSV export of the sheet
+        output_directory (str): Directory to keep the <lang>.json files in
+        poll_interval (float): Seconds between checks of the file
+    """
+    SheetWatcher(file_path, output_directory).run(poll_interval)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate locale files whenever the translation sheet changes")
+    parser.add_argument("file", help="Excel or CSV export of the translation sheet")
+    parser.add_argument("--output", default="translations", help="Output directory (default: translations)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Seconds between checks of the file")
+    args = parser.parse_args()
+
+    watch_sheet(args.file, args.output, args.interval)